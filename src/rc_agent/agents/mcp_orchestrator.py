@@ -1,15 +1,104 @@
 """Orchestrator using FastMCP tools (can be local or will support remote via MCP client in future)."""
 
-from agent_framework import ChatAgent, ai_function
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import DefaultAzureCredential
-from rc_agent.config.settings import settings
-from typing import Annotated
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from typing import TYPE_CHECKING, Annotated, Callable, Final
 from pydantic import Field
-import json
+import functools
+import threading
+import orjson
 
+if TYPE_CHECKING:
+    from agent_framework import ChatAgent
 
-def create_mcp_orchestrator() -> ChatAgent:
+# Serialized found tool results keyed by (tool name, arguments). The agent often
+# re-queries the same service/environment or job while reasoning, so a short
+# TTL avoids repeating the lookup without serving stale data for long.
+_tool_cache: TTLCache = TTLCache(maxsize=512, ttl=30)
+# TTLCache is not thread-safe; sync tools may be invoked from worker threads
+_tool_cache_lock = threading.Lock()
+
+# Tool argument types, built once at import rather than per factory call
+ServiceArg = Annotated[str, Field(
+    description="The service name (e.g., 'payments', 'checkout')")]
+EnvArg = Annotated[str, Field(
+    description="The environment (e.g., 'prod', 'staging')")]
+JobIdArg = Annotated[str, Field(
+    description="The job ID to retrieve logs for (e.g., 'job-789')")]
+
+# System prompt for the coordinator, kept byte-identical across agent builds
+_MCP_ORCHESTRATOR_INSTRUCTIONS: Final[str] = (
+    "You are a CI/CD deployment assistant. Your role is to help users "
+    "understand their deployment pipelines and troubleshoot failures.\n\n"
+    "You have access to two tools:\n"
+    "1. **get_pipeline_status** - Get current deployment pipeline status\n"
+    "   - Use when users ask about pipeline status, deployments, or 'what's the status'\n"
+    "   - Requires: service name and environment\n"
+    "2. **get_job_logs** - Retrieve and analyze job execution logs\n"
+    "   - Use when users ask about failures, errors, logs, or 'what went wrong'\n"
+    "   - Requires: job_id (usually from a failed pipeline)\n\n"
+    "Workflow:\n"
+    "- Listen carefully to what the user is asking\n"
+    "- For status queries: Use get_pipeline_status\n"
+    "- For failure analysis:\n"
+    "  1. First get the pipeline status to find the failed_job_id\n"
+    "  2. Then use get_job_logs with that job_id to analyze what went wrong\n"
+    "  3. Explain the root cause in simple, non-technical terms\n"
+    "- Be conversational and helpful\n"
+    "- Always use the tools to get actual data - never guess\n\n"
+    "Present responses clearly and help users understand their deployment health."
+)
+
+
+def memoize_tool(fn: Callable[..., dict]) -> Callable[..., str]:
+    """
+    Serialize a tool function's result and cache it by the arguments.
+
+    Only results with a truthy "found" are cached. Not-found results and
+    data file errors are returned uncached, so the tool picks up a job or
+    pipeline as soon as it appears instead of repeating the miss for the
+    rest of the TTL.
+
+    Args:
+        fn: Tool function returning a result dict with a "found" key
+
+    Returns:
+        Callable: Wrapped function returning JSON and sharing the
+            module-level TTL cache
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> str:
+        key = (fn.__name__, hashkey(*args, **kwargs))
+        with _tool_cache_lock:
+            cached = _tool_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = fn(*args, **kwargs)
+        serialized = orjson.dumps(result).decode()
+        if result.get("found"):
+            with _tool_cache_lock:
+                _tool_cache[key] = serialized
+        return serialized
+
+    return wrapper
+
+
+def clear_tool_cache() -> int:
+    """
+    Drop all memoized tool results.
+
+    Returns:
+        int: Number of cached entries that were removed
+    """
+    with _tool_cache_lock:
+        removed = len(_tool_cache)
+        _tool_cache.clear()
+    return removed
+
+
+@functools.lru_cache(maxsize=1)
+def create_mcp_orchestrator() -> "ChatAgent":
     """
     Create and return the orchestrator agent using FastMCP-style tools.
 
@@ -22,16 +111,20 @@ def create_mcp_orchestrator() -> ChatAgent:
     Architecture:
         User → Orchestrator Agent → [Direct Tool Calls] → FastMCP Functions → Response
 
+    The agent is built once per process; subsequent calls return the same
+    instance.
+
     Returns:
         ChatAgent: A configured coordinator that uses FastMCP tools
     """
+    # Deferred so importing this module does not load the agent framework
+    # and Azure SDK until an agent is actually built
+    from agent_framework import ai_function
+    from rc_agent.azure_clients import get_chat_client
+    from rc_agent.config.settings import settings
 
-    # Create Azure OpenAI chat client for the coordinator
-    chat_client = AzureOpenAIChatClient(
-        credential=DefaultAzureCredential(),
-        endpoint=settings.endpoint,
-        deployment_name=settings.deployment,
-    )
+    # Shared Azure OpenAI chat client for the coordinator
+    chat_client = get_chat_client(settings.endpoint, settings.deployment)
 
     # Import FastMCP tool functions
     from rc_agent.mcp.pipeline_mcp_server import get_pipeline_status as pipeline_tool
@@ -42,51 +135,24 @@ def create_mcp_orchestrator() -> ChatAgent:
         name="get_pipeline_status",
         description="Get the status of a deployment pipeline for a specific service and environment"
     )
-    def get_pipeline_status(
-        service: Annotated[str, Field(description="The service name (e.g., 'payments', 'checkout')")],
-        environment: Annotated[str, Field(
-            description="The environment (e.g., 'prod', 'staging')")]
-    ) -> str:
+    @memoize_tool
+    def get_pipeline_status(service: ServiceArg, environment: EnvArg) -> dict:
         """Get pipeline status using FastMCP tool."""
-        result = pipeline_tool(service=service, environment=environment)
-        return json.dumps(result)
+        return pipeline_tool(service=service, environment=environment)
 
     @ai_function(
         name="get_job_logs",
         description="Get the logs from a specific job to understand what happened during execution"
     )
-    def get_job_logs(
-        job_id: Annotated[str, Field(
-            description="The job ID to retrieve logs for (e.g., 'job-789')")]
-    ) -> str:
+    @memoize_tool
+    def get_job_logs(job_id: JobIdArg) -> dict:
         """Get job logs using FastMCP tool."""
-        result = logs_tool(job_id=job_id)
-        return json.dumps(result)
+        return logs_tool(job_id=job_id)
 
     # Create the coordinator agent with direct tools
     coordinator = chat_client.create_agent(
         name="release_copilot_coordinator",
-        instructions=(
-            "You are a CI/CD deployment assistant. Your role is to help users "
-            "understand their deployment pipelines and troubleshoot failures.\n\n"
-            "You have access to two tools:\n"
-            "1. **get_pipeline_status** - Get current deployment pipeline status\n"
-            "   - Use when users ask about pipeline status, deployments, or 'what's the status'\n"
-            "   - Requires: service name and environment\n"
-            "2. **get_job_logs** - Retrieve and analyze job execution logs\n"
-            "   - Use when users ask about failures, errors, logs, or 'what went wrong'\n"
-            "   - Requires: job_id (usually from a failed pipeline)\n\n"
-            "Workflow:\n"
-            "- Listen carefully to what the user is asking\n"
-            "- For status queries: Use get_pipeline_status\n"
-            "- For failure analysis:\n"
-            "  1. First get the pipeline status to find the failed_job_id\n"
-            "  2. Then use get_job_logs with that job_id to analyze what went wrong\n"
-            "  3. Explain the root cause in simple, non-technical terms\n"
-            "- Be conversational and helpful\n"
-            "- Always use the tools to get actual data - never guess\n\n"
-            "Present responses clearly and help users understand their deployment health."
-        ),
+        instructions=_MCP_ORCHESTRATOR_INSTRUCTIONS,
         tools=[get_pipeline_status, get_job_logs],
     )
 
@@ -1,41 +1,100 @@
 """FastAPI endpoint for Release Copilot chat service using MCP agent."""
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+import os
+import secrets
+import orjson
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+from typing import Any, List, Optional
+from rc_agent.config.settings import settings
 from rc_agent.telemetry.otel import init_tracing
 
+# Log through uvicorn's logger so messages share its handlers and format
+logger = logging.getLogger("uvicorn.error")
+
 # Initialize tracing
 init_tracing()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the agent before serving requests and share it across them."""
+    # Deferred so the agent stack is only imported once the server starts
+    from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+
+    # The factory is cached per process; build it off the event loop since
+    # client construction is blocking
+    app.state.agent = await asyncio.to_thread(create_mcp_orchestrator)
+    logger.info("✓ Release Copilot agent initialized")
+    yield
+
+    # Release pooled connections to Azure OpenAI on shutdown; this also
+    # forgets the agent built on them so a restarted app builds a fresh one
+    from rc_agent.azure_clients import close_clients
+
+    await close_clients()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Release Copilot API",
     description="CI/CD deployment assistant API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson encodes the (potentially long) message history faster
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS
+# Configure CORS with an explicit allowlist; a wildcard origin cannot be
+# combined with credentials. Browsers may cache preflight results for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
-# Create the agent instance (shared across requests)
-agent = None
+# Agent threads keyed by conversation ID, so follow-up messages continue the
+# same conversation instead of starting from scratch. IDs are minted by the
+# server and unguessable. Threads live in this worker process only and
+# expire after an hour without use.
+_threads: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+
+def _get_thread(agent, conversation_id: Optional[str]) -> tuple[str, Any]:
+    """
+    Return the agent thread for a conversation, starting one if needed.
+
+    A missing, unknown or expired conversation ID starts a new conversation
+    under a newly minted ID rather than failing, so clients that send their
+    own IDs keep working. Clients should continue with the conversation_id
+    of the latest response.
 
+    Args:
+        agent: The shared ChatAgent
+        conversation_id: Conversation ID returned by an earlier response, if any
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the agent on startup."""
-    global agent
-    agent = create_mcp_orchestrator()
-    print("✓ Release Copilot agent initialized")
+    Returns:
+        tuple: The conversation ID (newly minted for a new conversation) and
+            its thread
+    """
+    thread = _threads.get(conversation_id) if conversation_id else None
+    if thread is None:
+        # Never adopt a client-chosen ID, so nobody can pick (or guess)
+        # the ID of another user's conversation
+        conversation_id = secrets.token_urlsafe(32)
+        thread = agent.get_new_thread()
+    # Re-insert on every use so active conversations do not expire
+    _threads[conversation_id] = thread
+    return conversation_id, thread
 
 
 # Request/Response models
@@ -49,7 +108,13 @@ class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     message: str = Field(..., description="User's message/question")
     conversation_id: Optional[str] = Field(
-        None, description="Optional conversation ID for context")
+        None,
+        description=(
+            "Conversation ID from an earlier response, to continue that "
+            "conversation"
+        ))
+    include_history: bool = Field(
+        False, description="Include the full message history in the response")
 
 
 class ChatResponse(BaseModel):
@@ -57,7 +122,8 @@ class ChatResponse(BaseModel):
     response: str = Field(..., description="Agent's response")
     conversation_id: Optional[str] = Field(None, description="Conversation ID")
     messages: List[Message] = Field(
-        default_factory=list, description="Full conversation history")
+        default_factory=list,
+        description="Full conversation history (only when include_history is set)")
 
 
 class HealthResponse(BaseModel):
@@ -88,7 +154,7 @@ async def health_check():
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """
     Chat endpoint for interacting with the Release Copilot agent.
 
@@ -96,35 +162,40 @@ async def chat(request: ChatRequest):
 
     Args:
         request: ChatRequest containing the user's message
+        http_request: Incoming HTTP request, used to reach the shared agent
 
     Returns:
-        ChatResponse with the agent's response and conversation history
+        ChatResponse with the agent's response, plus the conversation history
+        when request.include_history is set
     """
+    agent = getattr(http_request.app.state, "agent", None)
     if agent is None:
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
     try:
-        # Run the agent with the user's message
-        result = await agent.run(request.message)
-
-        # Extract the assistant's response
-        assistant_response = ""
+        # Run the agent with the user's message on the conversation's thread
+        conversation_id, thread = _get_thread(agent, request.conversation_id)
+        result = await agent.run(request.message, thread=thread)
+
+        # The reply is the last non-empty assistant message; result.text would
+        # also join interim assistant turns made around tool calls
+        assistant_response = next(
+            (msg.text for msg in reversed(result.messages)
+             if msg.role.value == "assistant" and msg.text),
+            None
+        ) or result.text
+
+        # Build conversation history only when asked for
         conversation_messages = []
-
-        for msg in result.messages:
-            # Build conversation history
-            conversation_messages.append({
-                "role": msg.role.value,
-                "content": msg.text or ""
-            })
-
-            # Get the last assistant message as the response
-            if msg.role.value == "assistant" and msg.text:
-                assistant_response = msg.text
+        if request.include_history:
+            conversation_messages = [
+                Message(role=msg.role.value, content=msg.text or "")
+                for msg in result.messages
+            ]
 
         return ChatResponse(
             response=assistant_response or "I'm sorry, I couldn't generate a response.",
-            conversation_id=request.conversation_id,
+            conversation_id=conversation_id,
             messages=conversation_messages
         )
 
@@ -133,15 +204,78 @@ async def chat(request: ChatRequest):
             status_code=500, detail=f"Error processing request: {str(e)}")
 
 
+def _sse_event(payload: dict, event: Optional[str] = None) -> str:
+    """Format a payload as a server-sent event frame."""
+    data = orjson.dumps(payload).decode()
+    if event:
+        return f"event: {event}\ndata: {data}\n\n"
+    return f"data: {data}\n\n"
+
+
 @app.post("/chat/stream")
-async def chat_stream(request: ChatRequest):
+async def chat_stream(request: ChatRequest, http_request: Request):
     """
-    Streaming chat endpoint (placeholder for future implementation).
+    Streaming chat endpoint using server-sent events (SSE).
+
+    Text deltas are sent as `data: {"delta": "..."}` frames as the agent
+    produces them, followed by an `event: done` frame. Errors raised while
+    streaming are reported as an `event: error` frame.
 
-    For now, this redirects to the standard chat endpoint.
-    Future: Implement server-sent events (SSE) for streaming responses.
+    Args:
+        request: ChatRequest containing the user's message
+        http_request: Incoming HTTP request, used to reach the shared agent
+
+    Returns:
+        StreamingResponse emitting text/event-stream frames
     """
-    return await chat(request)
+    agent = getattr(http_request.app.state, "agent", None)
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+
+    conversation_id, thread = _get_thread(agent, request.conversation_id)
+
+    async def event_stream():
+        try:
+            async for update in agent.run_stream(request.message, thread=thread):
+                if update.text:
+                    yield _sse_event({"delta": update.text})
+        except Exception as e:
+            yield _sse_event(
+                {"detail": f"Error processing request: {str(e)}"}, event="error")
+            return
+        yield _sse_event({"conversation_id": conversation_id}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+def _require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Allow a request only if it carries the configured admin token.
+
+    Admin endpoints are disabled (404) unless RC_ADMIN_TOKEN is set.
+
+    Raises:
+        HTTPException: 404 if admin endpoints are disabled, 401 if the
+            X-Admin-Token header is missing or wrong
+    """
+    if settings.admin_token is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(
+            x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@app.post("/admin/cache/clear", dependencies=[Depends(_require_admin)])
+async def clear_cache():
+    """
+    Clear memoized tool results so the next tool calls re-read the data files.
+
+    The cache lives in each worker process, so this only clears the worker
+    that handles the request; its PID is returned so callers can tell.
+    """
+    from rc_agent.agents.mcp_orchestrator import clear_tool_cache
+
+    return {"cleared_entries": clear_tool_cache(), "pid": os.getpid()}
 
 
 # Example usage section
@@ -171,11 +305,40 @@ async def get_examples():
 
 
 if __name__ == "__main__":
+    import logging.config
+    import sys
     import uvicorn
-
-    print("Starting Release Copilot API...")
-    print("Documentation: http://localhost:8000/docs")
-    print("Health Check: http://localhost:8000/health")
-    print("Chat Endpoint: POST http://localhost:8000/chat")
-
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from uvicorn.config import LOGGING_CONFIG
+
+    # Apply uvicorn's logging setup now rather than inside uvicorn.run(), so
+    # the startup messages below already go through its handlers
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+    logger.info("Starting Release Copilot API...")
+    logger.info("Documentation: http://localhost:8000/docs")
+    logger.info("Health Check: http://localhost:8000/health")
+    logger.info("Chat Endpoint: POST http://localhost:8000/chat")
+
+    # Conversation threads and the tool cache live in each worker's memory,
+    # and uvicorn does not route a conversation back to the same worker, so
+    # the default is one worker. More need an external thread store.
+    workers = int(os.getenv("RC_WORKERS", "1"))
+    if workers > 1:
+        logger.warning(
+            "RC_WORKERS=%d: conversations are only kept by the worker that "
+            "created them, so follow-up messages may lose their history",
+            workers)
+
+    # uvloop and the httptools parser come with uvicorn[standard]; uvloop is
+    # not available on Windows, where the default asyncio loop is used.
+    # Multiple workers require the "module:app" import string; each worker
+    # builds its own agent once in the lifespan handler.
+    uvicorn.run(
+        "rc_agent.app.api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=workers,
+        log_level="info",
+    )
@@ -1,9 +1,9 @@
-from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
-from agent_framework_devui import serve
-
-
 def main():
     """Launch the Release Copilot agent with DevUI interface."""
+    # Deferred so importing this module does not load the agent stack
+    from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+    from agent_framework_devui import serve
+
     # Create the agent (using MCP orchestrator)
     agent = create_mcp_orchestrator()
 
@@ -0,0 +1,150 @@
+"""Process-wide Azure credential and client singletons.
+
+Constructing DefaultAzureCredential probes several credential sources and
+each instance keeps its own token cache, so the credential, token provider,
+HTTP connection pool and chat clients are created once and shared by every
+caller.
+"""
+
+import functools
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+import httpx
+from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
+
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
+    from openai import AsyncAzureOpenAI
+
+# Token scope for Azure OpenAI (Cognitive Services)
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# Azure OpenAI data-plane API version used by the chat clients
+AZURE_OPENAI_API_VERSION = "2024-10-21"
+
+
+@functools.lru_cache(maxsize=1)
+def get_credential() -> DefaultAzureCredential:
+    """
+    Return the shared async Azure credential.
+
+    Returns:
+        DefaultAzureCredential: Credential reused for every token request
+    """
+    return DefaultAzureCredential()
+
+
+@functools.lru_cache(maxsize=1)
+def get_token_provider() -> Callable[[], Awaitable[str]]:
+    """
+    Return a bearer token provider for Azure OpenAI backed by the shared credential.
+
+    The provider is async so token refreshes do not block the event loop; it
+    is meant for the async OpenAI clients.
+
+    Returns:
+        Callable: Zero-argument coroutine function returning a bearer token
+    """
+    return get_bearer_token_provider(get_credential(), COGNITIVE_SERVICES_SCOPE)
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared async HTTP client used for Azure OpenAI calls.
+
+    One pool keeps TCP/TLS connections (multiplexed over HTTP/2) alive across
+    requests and agents instead of each client opening its own.
+
+    Returns:
+        httpx.AsyncClient: Pooled HTTP/2 client
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=60,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+    )
+
+
+@functools.lru_cache
+def get_chat_client(endpoint: str, deployment: str) -> "AzureOpenAIChatClient":
+    """
+    Return the shared Azure OpenAI chat client for an endpoint and deployment.
+
+    Sharing one client lets every agent reuse the same HTTP connection pool
+    and bearer token cache instead of each opening its own.
+
+    Args:
+        endpoint: Azure OpenAI endpoint URL
+        deployment: Model deployment name
+
+    Returns:
+        AzureOpenAIChatClient: Chat client for the given deployment
+    """
+    # Deferred so credential-only callers do not load the agent framework
+    from agent_framework.azure import AzureOpenAIChatClient
+    from openai import AsyncAzureOpenAI
+
+    async_client = AsyncAzureOpenAI(
+        azure_endpoint=endpoint,
+        azure_deployment=deployment,
+        azure_ad_token_provider=get_token_provider(),
+        api_version=AZURE_OPENAI_API_VERSION,
+        http_client=get_http_client(),
+    )
+    return AzureOpenAIChatClient(
+        endpoint=endpoint,
+        deployment_name=deployment,
+        async_client=async_client,
+    )
+
+
+@functools.lru_cache
+def get_openai_client(endpoint: str, max_retries: int = 2) -> "AsyncAzureOpenAI":
+    """
+    Return the shared raw Azure OpenAI client for an endpoint.
+
+    Used for direct completion calls outside the agent framework, such as
+    the evaluation judge, so they share the same connection pool and token
+    cache as the chat clients.
+
+    Args:
+        endpoint: Azure OpenAI endpoint URL
+        max_retries: Retries the SDK makes on rate limits, timeouts and 5xx
+
+    Returns:
+        AsyncAzureOpenAI: Client for the given endpoint
+    """
+    from openai import AsyncAzureOpenAI
+
+    return AsyncAzureOpenAI(
+        azure_endpoint=endpoint,
+        azure_ad_token_provider=get_token_provider(),
+        api_version=AZURE_OPENAI_API_VERSION,
+        http_client=get_http_client(),
+        max_retries=max_retries,
+    )
+
+
+async def close_clients() -> None:
+    """
+    Close the shared HTTP pool and credential and drop everything built on them.
+
+    Call on application shutdown or at the end of a run; the next
+    get_chat_client() or create_mcp_orchestrator() call builds a fresh
+    client, pool and credential.
+    """
+    # Deferred like the factory itself; the cached agent holds a chat client
+    # on the pool being closed, so it must not outlive it
+    from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+    if get_credential.cache_info().currsize:
+        await get_credential().close()
+    create_mcp_orchestrator.cache_clear()
+    get_chat_client.cache_clear()
+    get_openai_client.cache_clear()
+    get_http_client.cache_clear()
+    get_token_provider.cache_clear()
+    get_credential.cache_clear()
@@ -1,5 +1,7 @@
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load .env file from project root
@@ -7,13 +9,28 @@ project_root = Path(__file__).parent.parent.parent.parent
 load_dotenv(project_root / ".env")
 
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    def __init__(self):
-        self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+    """Application settings, read from the environment once at import."""
 
-        # Track data directory path
-        self.data_dir = project_root / "data"
+    endpoint: Optional[str]
+    deployment: Optional[str]
+    # Track data directory path
+    data_dir: Path
+    # Origins allowed to call the API from a browser (comma-separated RC_CORS)
+    cors_origins: tuple[str, ...]
+    # Token for the /admin endpoints (RC_ADMIN_TOKEN); unset disables them
+    admin_token: Optional[str]
 
 
-settings = Settings()
+settings = Settings(
+    endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+    deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+    data_dir=project_root / "data",
+    cors_origins=tuple(
+        origin.strip()
+        for origin in os.getenv("RC_CORS", "http://localhost:3000").split(",")
+        if origin.strip()
+    ),
+    admin_token=os.getenv("RC_ADMIN_TOKEN") or None,
+)
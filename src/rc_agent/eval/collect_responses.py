@@ -5,19 +5,55 @@ This script runs the agent against test queries and captures the tool calls
 and responses for later evaluation.
 """
 
-import json
+import functools
+import logging
+import logging.handlers
+import queue
+import sys
+import orjson
 from pathlib import Path
 from typing import Any
 from datetime import datetime
 import asyncio
 
-from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+# Named explicitly: under `python -m` __name__ is "__main__", which would fall
+# outside the "rc_agent.eval" logger that configure_logging() sets up
+logger = logging.getLogger("rc_agent.eval.collect_responses")
 
 
+def configure_logging() -> logging.handlers.QueueListener:
+    """
+    Route rc_agent.eval log records to stdout through a background thread.
+
+    Records are put on a queue by the calling coroutine and written by a
+    QueueListener thread, so console writes do not block the event loop.
+
+    Returns:
+        logging.handlers.QueueListener: Started listener; call stop() to flush
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, logging.StreamHandler(sys.stdout))
+
+    eval_logger = logging.getLogger("rc_agent.eval")
+    eval_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    eval_logger.setLevel(logging.INFO)
+    # Keep records out of the root logger so they are written only once
+    eval_logger.propagate = False
+
+    listener.start()
+    return listener
+
+
+@functools.lru_cache(maxsize=4)
 def load_test_queries(file_path: Path) -> list[dict[str, Any]]:
-    """Load test queries from ground truth file."""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    """
+    Load test queries from ground truth file.
+
+    Parsed results are cached per path for repeated runs in one session;
+    callers must treat the returned list as read-only.
+    """
+    return orjson.loads(file_path.read_bytes())
 
 
 def extract_tool_calls_from_response(response) -> list[dict[str, Any]]:
@@ -29,108 +65,153 @@ def extract_tool_calls_from_response(response) -> list[dict[str, Any]]:
     """
     tool_calls = []
 
-    # The response has a messages attribute containing ChatMessage objects
-    if hasattr(response, 'messages'):
-        for message in response.messages:
-            # Each message can have a 'contents' attribute
-            if hasattr(message, 'contents'):
-                for content in message.contents:
-                    # Check if this content is a function call
-                    # We can use to_dict() to inspect it
-                    if hasattr(content, 'to_dict'):
-                        content_dict = content.to_dict()
-                        if content_dict.get('type') == 'function_call':
-                            tool_info = {
-                                'id': content_dict.get('call_id'),
-                                'name': content_dict.get('name'),
-                                'arguments': json.loads(content_dict.get('arguments', '{}'))
-                            }
-                            tool_calls.append(tool_info)
+    # The response has a messages attribute containing ChatMessage objects,
+    # each with a list of contents. Read the function call fields directly
+    # instead of materializing every content via to_dict().
+    for message in getattr(response, 'messages', ()):
+        for content in getattr(message, 'contents', ()):
+            if getattr(content, 'type', None) != 'function_call':
+                continue
+
+            # Arguments arrive either as a JSON string or an already-parsed mapping
+            arguments = content.arguments
+            if isinstance(arguments, str):
+                arguments = orjson.loads(arguments) if arguments else {}
+
+            tool_calls.append({
+                'id': content.call_id,
+                'name': content.name,
+                'arguments': dict(arguments) if arguments else {}
+            })
 
     return tool_calls
 
 
-async def run_agent_collection():
+async def _run_single(
+    agent,
+    idx: int,
+    total: int,
+    test_case: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Run the agent on one test case and build its collected record.
+
+    Args:
+        agent: The ChatAgent instance
+        idx: 1-based test case number
+        total: Total number of test cases, for progress output
+        test_case: Ground truth entry with the query and expected tools
+
+    Returns:
+        dict: Collected record with tool calls and response, or the error
+    """
+    logger.info(f"\n{'=' * 80}")
+    logger.info(f"Running Test Case {idx}/{total}")
+    logger.info(f"Query: {test_case['query']}")
+
+    try:
+        # Run the agent (it's async!)
+        response = await agent.run(test_case['query'])
+
+        # Extract tool calls
+        tool_calls = extract_tool_calls_from_response(response)
+
+        # Get response text
+        response_text = str(response)
+
+        logger.info(f"\n✓ Test Case {idx}: Agent completed successfully")
+        logger.info(f"Tool calls detected: {len(tool_calls)}")
+        for tc in tool_calls:
+            logger.info(
+                f"  - {tc.get('name', 'unknown')}: {tc.get('arguments', {})}")
+
+        return {
+            'test_case_id': idx,
+            'query': test_case['query'],
+            'expected_tools': test_case['expected_tools'],
+            'expected_tool_args': test_case.get('expected_tool_args', {}),
+            'actual_tool_calls': tool_calls,
+            'response': response_text,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        logger.exception(f"\n❌ Test Case {idx}: Error running agent: {e}")
+
+        return {
+            'test_case_id': idx,
+            'query': test_case['query'],
+            'expected_tools': test_case['expected_tools'],
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+async def run_agent_collection(concurrency: int = 8):
     """
     Run agent against test queries and collect responses with tool calls.
+
+    Test cases are independent, I/O-bound LLM round trips, so they run
+    concurrently with at most `concurrency` agent runs in flight.
+
+    Args:
+        concurrency: Maximum number of test cases run at the same time
     """
-    print("=" * 80)
-    print("Agent Response Collection for Evaluation")
-    print("=" * 80)
+    logger.info("=" * 80)
+    logger.info("Agent Response Collection for Evaluation")
+    logger.info("=" * 80)
 
     # Load test queries
     eval_dir = Path(__file__).parent
     ground_truth_file = eval_dir / "ground_truth.json"
     test_cases = load_test_queries(ground_truth_file)
 
-    print(f"\nLoaded {len(test_cases)} test queries from {ground_truth_file}")
-
-    # Create agent
-    print("\nInitializing agent...")
-    agent = create_mcp_orchestrator()
-    print("Agent initialized successfully!")
-
-    # Collect responses
-    collected_data = []
-
-    for idx, test_case in enumerate(test_cases, 1):
-        print(f"\n{'=' * 80}")
-        print(f"Running Test Case {idx}/{len(test_cases)}")
-        print(f"Query: {test_case['query']}")
-
-        try:
-            # Run the agent (it's async!)
-            response = await agent.run(test_case['query'])
-
-            # Extract tool calls
-            tool_calls = extract_tool_calls_from_response(response)
-
-            # Get response text
-            response_text = str(response)
-
-            print("\n✓ Agent completed successfully")
-            print(f"Tool calls detected: {len(tool_calls)}")
-            for tc in tool_calls:
-                print(
-                    f"  - {tc.get('name', 'unknown')}: {tc.get('arguments', {})}")
-
-            # Store collected data
-            collected_data.append({
-                'test_case_id': idx,
-                'query': test_case['query'],
-                'expected_tools': test_case['expected_tools'],
-                'expected_tool_args': test_case.get('expected_tool_args', {}),
-                'actual_tool_calls': tool_calls,
-                'response': response_text,
-                'timestamp': datetime.now().isoformat()
-            })
+    logger.info(f"\nLoaded {len(test_cases)} test queries from {ground_truth_file}")
 
-        except Exception as e:
-            print(f"\n❌ Error running agent: {e}")
-            import traceback
-            traceback.print_exc()
-
-            collected_data.append({
-                'test_case_id': idx,
-                'query': test_case['query'],
-                'expected_tools': test_case['expected_tools'],
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            })
+    # Create agent; imported here so importing this module stays cheap
+    from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+    from rc_agent.azure_clients import close_clients
+
+    try:
+        logger.info("\nInitializing agent...")
+        agent = create_mcp_orchestrator()
+        logger.info("Agent initialized successfully!")
+
+        # Collect responses; gather keeps results in test case order
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_bounded(idx: int, test_case: dict[str, Any]) -> dict[str, Any]:
+            async with semaphore:
+                return await _run_single(agent, idx, len(test_cases), test_case)
+
+        collected_data = await asyncio.gather(
+            *(run_bounded(idx, test_case)
+              for idx, test_case in enumerate(test_cases, 1))
+        )
+    finally:
+        # Release the shared connection pool used by the agent, even when a
+        # run fails part way
+        await close_clients()
 
     # Save collected data
     output_file = eval_dir / "collected_responses.json"
-    with open(output_file, 'w') as f:
-        json.dump(collected_data, f, indent=2)
+    output_file.write_bytes(
+        orjson.dumps(collected_data, option=orjson.OPT_INDENT_2))
 
-    print(f"\n{'=' * 80}")
-    print("Collection complete!")
-    print(f"Collected {len(collected_data)} responses")
-    print(f"Saved to: {output_file}")
-    print(f"{'=' * 80}\n")
+    logger.info(f"\n{'=' * 80}")
+    logger.info("Collection complete!")
+    logger.info(f"Collected {len(collected_data)} responses")
+    logger.info(f"Saved to: {output_file}")
+    logger.info(f"{'=' * 80}\n")
 
     return collected_data
 
 
 if __name__ == "__main__":
-    asyncio.run(run_agent_collection())
+    from rc_agent.event_loop import run
+
+    listener = configure_logging()
+    try:
+        run(run_agent_collection())
+    finally:
+        listener.stop()
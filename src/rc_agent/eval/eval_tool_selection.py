@@ -6,25 +6,68 @@ It uses Azure OpenAI's evaluation capabilities without requiring AI Projects SDK
 """
 
 import os
-import json
 import asyncio
+import functools
+import orjson
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 
 from rc_agent.agents.mcp_orchestrator import create_mcp_orchestrator
+from rc_agent.azure_clients import close_clients, get_openai_client
 from rc_agent.config.settings import settings
+from rc_agent.eval.collect_responses import extract_tool_calls_from_response
+from rc_agent.eval.evaluate import (
+    EXACT_MATCH_EVALUATION,
+    build_judge_messages,
+    judge_failure,
+    load_collected_responses,
+)
 
 # Load environment variables
 load_dotenv()
 
-
+@functools.lru_cache(maxsize=4)
 def load_ground_truth(file_path: Path) -> list[dict[str, Any]]:
-    """Load ground truth test cases from JSON file."""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    """
+    Load ground truth test cases from JSON file.
+
+    Parsed results are cached per path for repeated runs in one session;
+    callers must treat the returned list as read-only.
+    """
+    return orjson.loads(file_path.read_bytes())
+
+
+def load_reusable_responses(
+    responses_file: Path,
+    ground_truth_file: Path
+) -> dict[int, dict[str, Any]]:
+    """
+    Load collected responses that can stand in for running the agent.
+
+    Responses are only reused when the file is newer than the ground truth.
+    Records that failed during collection are left out so those test cases
+    are run again instead of replaying the error.
+
+    Args:
+        responses_file: collected_responses.json from an earlier run
+        ground_truth_file: Ground truth the responses were collected for
+
+    Returns:
+        dict mapping test_case_id to its collected record; empty if the file
+        is missing or stale
+    """
+    if (not responses_file.exists()
+            or responses_file.stat().st_mtime <= ground_truth_file.stat().st_mtime):
+        return {}
+
+    return {
+        record['test_case_id']: record
+        for record in load_collected_responses(responses_file)
+        if 'error' not in record
+    }
 
 
 async def run_agent_and_capture_tools(agent, query: str) -> dict[str, Any]:
@@ -41,27 +84,10 @@ async def run_agent_and_capture_tools(agent, query: str) -> dict[str, Any]:
     # Run the agent (async)
     response = await agent.run(query)
 
-    # Extract tool calls from the response
-    tool_calls = []
-
-    # The response has messages with contents
-    if hasattr(response, 'messages'):
-        for message in response.messages:
-            if hasattr(message, 'contents'):
-                for content in message.contents:
-                    if hasattr(content, 'to_dict'):
-                        content_dict = content.to_dict()
-                        if content_dict.get('type') == 'function_call':
-                            tool_calls.append({
-                                'id': content_dict.get('call_id'),
-                                'name': content_dict.get('name'),
-                                'arguments': json.loads(content_dict.get('arguments', '{}'))
-                            })
-
     return {
         'query': query,
         'response': str(response),
-        'tool_calls': tool_calls
+        'tool_calls': extract_tool_calls_from_response(response)
     }
 
 
@@ -79,14 +105,13 @@ def evaluate_tool_selection_manual(
     Returns:
         dict with evaluation metrics
     """
-    actual_tools = [tc['name'] for tc in actual_tool_calls if tc.get('name')]
-
     # Check if all expected tools were called
-    expected_set = set(expected_tools)
-    actual_set = set(actual_tools)
+    expected_set = frozenset(expected_tools)
+    actual_set = frozenset(
+        name for name in (tc.get('name') for tc in actual_tool_calls) if name)
 
     # Calculate metrics
-    correct_tools = expected_set.intersection(actual_set)
+    correct_tools = expected_set & actual_set
     missing_tools = expected_set - actual_set
     extra_tools = actual_set - expected_set
 
@@ -108,162 +133,102 @@ def evaluate_tool_selection_manual(
         'recall': recall,
         'f1_score': f1,
         'exact_match': exact_match,
-        'expected_tools': list(expected_set),
-        'actual_tools': list(actual_set),
-        'correct_tools': list(correct_tools),
-        'missing_tools': list(missing_tools),
-        'extra_tools': list(extra_tools)
+        'expected_tools': sorted(expected_set),
+        'actual_tools': sorted(actual_set),
+        'correct_tools': sorted(correct_tools),
+        'missing_tools': sorted(missing_tools),
+        'extra_tools': sorted(extra_tools)
     }
 
 
-def evaluate_tool_selection_with_llm(
-    client: AzureOpenAI,
+async def evaluate_tool_selection_with_llm(
+    client: AsyncAzureOpenAI,
     query: str,
     response: str,
     tool_calls: list[dict[str, Any]],
-    tool_definitions: list[dict[str, Any]],
     expected_tools: list[str]
 ) -> dict[str, Any]:
     """
     Use Azure OpenAI to evaluate tool selection quality.
 
     Args:
-        client: AzureOpenAI client instance
+        client: AsyncAzureOpenAI client instance
         query: User query
         response: Agent response
         tool_calls: List of tool calls made
-        tool_definitions: Available tool definitions
         expected_tools: Expected tools that should have been called
 
     Returns:
         dict with LLM-based evaluation results
     """
-    evaluation_prompt = f"""You are an expert evaluator for AI agent tool selection.
-
-Evaluate whether the agent selected the appropriate tools for the given user query.
-
-User Query: {query}
-
-Available Tools:
-{json.dumps(tool_definitions, indent=2)}
-
-Expected Tools: {', '.join(expected_tools)}
-
-Actual Tool Calls:
-{json.dumps(tool_calls, indent=2)}
-
-Agent Response:
-{response}
-
-Evaluate the tool selection on the following criteria:
-1. Correctness: Did the agent select the right tools for the query?
-2. Completeness: Were all necessary tools selected?
-3. Efficiency: Were any unnecessary tools selected?
-
-Provide your evaluation in JSON format:
-{{
-    "correctness_score": <float 0-1>,
-    "completeness_score": <float 0-1>,
-    "efficiency_score": <float 0-1>,
-    "overall_score": <float 0-1>,
-    "reasoning": "<brief explanation>"
-}}
-"""
-
     try:
-        eval_response = client.chat.completions.create(
+        eval_response = await client.chat.completions.create(
             model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
-            messages=[
-                {"role": "system", "content": "You are an expert AI evaluator. Respond only with valid JSON."},
-                {"role": "user", "content": evaluation_prompt}
-            ],
+            messages=build_judge_messages(
+                query, response, tool_calls, expected_tools),
             temperature=0,
             response_format={"type": "json_object"}
         )
 
-        result = json.loads(eval_response.choices[0].message.content)
+        result = orjson.loads(eval_response.choices[0].message.content)
         return result
     except Exception as e:
-        return {
-            "error": str(e),
-            "correctness_score": 0,
-            "completeness_score": 0,
-            "efficiency_score": 0,
-            "overall_score": 0,
-            "reasoning": f"Evaluation failed: {str(e)}"
-        }
-
-
-async def run_evaluation():
-    """Main evaluation function."""
-    print("=" * 80)
-    print("Tool Selection Accuracy Evaluation")
-    print("=" * 80)
-
-    # Load ground truth
-    eval_dir = Path(__file__).parent
-    ground_truth_file = eval_dir / "ground_truth.json"
-    ground_truth = load_ground_truth(ground_truth_file)
-
-    print(f"\nLoaded {len(ground_truth)} test cases from {ground_truth_file}")
+        return judge_failure(str(e))
+
+
+async def _run_case(
+    agent,
+    eval_client: AsyncAzureOpenAI,
+    idx: int,
+    total: int,
+    test_case: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    collected: dict[str, Any] | None = None,
+    force_llm: bool = False
+) -> dict[str, Any]:
+    """
+    Run and evaluate a single test case.
 
-    # Create agent
-    print("\nInitializing agent...")
-    agent = create_mcp_orchestrator()
+    The report for the test case is printed in one block once it finishes so
+    output from concurrently running cases does not interleave.
 
-    # Create Azure OpenAI client for evaluation
-    print("Initializing Azure OpenAI evaluator client...")
-    eval_client = AzureOpenAI(
-        api_version="2024-10-21",
-        azure_endpoint=settings.endpoint,
-        azure_ad_token_provider=lambda: DefaultAzureCredential().get_token(
-            "https://cognitiveservices.azure.com/.default"
-        ).token
-    )
+    Args:
+        agent: The ChatAgent instance
+        eval_client: AsyncAzureOpenAI client used as the judge
+        idx: 1-based test case number
+        total: Total number of test cases
+        test_case: Ground truth test case
+        semaphore: Bounds how many test cases run at once
+        collected: Previously collected response to judge instead of
+            running the agent
+        force_llm: Whether to judge exact matches instead of short-circuiting
 
-    # Tool definitions for the evaluator
-    tool_definitions = [
-        {
-            "name": "get_pipeline_status",
-            "description": "Get the status of a deployment pipeline for a specific service and environment",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "service": {"type": "string", "description": "The service name (e.g., 'payments', 'checkout')"},
-                    "environment": {"type": "string", "description": "The environment (e.g., 'prod', 'staging')"}
-                },
-                "required": ["service", "environment"]
-            }
-        },
-        {
-            "name": "get_job_logs",
-            "description": "Get the logs from a specific job to understand what happened during execution",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "job_id": {"type": "string", "description": "The job ID to retrieve logs for (e.g., 'job-789')"}
-                },
-                "required": ["job_id"]
-            }
-        }
+    Returns:
+        dict with the combined evaluation result, or the error
+    """
+    lines = [
+        f"\n{'=' * 80}",
+        f"Test Case {idx}/{total}",
+        f"Query: {test_case['query']}",
+        f"Expected Tools: {test_case['expected_tools']}",
     ]
 
-    # Run evaluation
-    results = []
-
-    for idx, test_case in enumerate(ground_truth, 1):
-        print(f"\n{'=' * 80}")
-        print(f"Test Case {idx}/{len(ground_truth)}")
-        print(f"Query: {test_case['query']}")
-        print(f"Expected Tools: {test_case['expected_tools']}")
-
-        # Run agent
+    async with semaphore:
         try:
-            agent_result = await run_agent_and_capture_tools(agent, test_case['query'])
-
-            print("\nActual Tool Calls:")
+            if collected is None:
+                agent_result = await run_agent_and_capture_tools(
+                    agent, test_case['query'])
+            else:
+                agent_result = {
+                    'query': test_case['query'],
+                    'response': collected.get('response', ''),
+                    'tool_calls': collected.get('actual_tool_calls', [])
+                }
+
+            lines.append("\nActual Tool Calls:")
             for tc in agent_result['tool_calls']:
-                print(f"  - {tc['name']}: {tc.get('arguments', {})}")
+                lines.append(f"  - {tc.get('name', '<unknown>')}: "
+                             f"{tc.get('arguments', {})}")
 
             # Manual evaluation
             manual_eval = evaluate_tool_selection_manual(
@@ -271,15 +236,17 @@ async def run_evaluation():
                 agent_result['tool_calls']
             )
 
-            # LLM-based evaluation
-            llm_eval = evaluate_tool_selection_with_llm(
-                eval_client,
-                test_case['query'],
-                agent_result['response'],
-                agent_result['tool_calls'],
-                tool_definitions,
-                test_case['expected_tools']
-            )
+            # LLM-based evaluation, skipped when the tools match exactly
+            if manual_eval['exact_match'] and not force_llm:
+                llm_eval = dict(EXACT_MATCH_EVALUATION)
+            else:
+                llm_eval = await evaluate_tool_selection_with_llm(
+                    eval_client,
+                    test_case['query'],
+                    agent_result['response'],
+                    agent_result['tool_calls'],
+                    test_case['expected_tools']
+                )
 
             # Combine results
             result = {
@@ -292,26 +259,118 @@ async def run_evaluation():
                 'response': agent_result['response']
             }
 
-            results.append(result)
-
-            # Print summary
-            print("\nManual Evaluation:")
-            print(f"  Precision: {manual_eval['precision']:.2f}")
-            print(f"  Recall: {manual_eval['recall']:.2f}")
-            print(f"  F1 Score: {manual_eval['f1_score']:.2f}")
-            print(f"  Exact Match: {manual_eval['exact_match']}")
+            # Summary
+            lines.append("\nManual Evaluation:")
+            lines.append(f"  Precision: {manual_eval['precision']:.2f}")
+            lines.append(f"  Recall: {manual_eval['recall']:.2f}")
+            lines.append(f"  F1 Score: {manual_eval['f1_score']:.2f}")
+            lines.append(f"  Exact Match: {manual_eval['exact_match']}")
 
-            print("\nLLM Evaluation:")
-            print(f"  Overall Score: {llm_eval.get('overall_score', 0):.2f}")
-            print(f"  Reasoning: {llm_eval.get('reasoning', 'N/A')}")
+            lines.append("\nLLM Evaluation:")
+            lines.append(f"  Overall Score: {llm_eval.get('overall_score', 0):.2f}")
+            lines.append(f"  Reasoning: {llm_eval.get('reasoning', 'N/A')}")
 
         except Exception as e:
-            print(f"\n❌ Error running test case: {e}")
-            results.append({
+            lines.append(f"\n❌ Error running test case: {e}")
+            result = {
                 'test_case_id': idx,
                 'query': test_case['query'],
+                'expected_tools': test_case['expected_tools'],
                 'error': str(e)
-            })
+            }
+
+    print("\n".join(lines))
+    return result
+
+
+async def run_evaluation(force_llm: bool = False, reuse_responses: bool = False):
+    """
+    Main evaluation function.
+
+    Args:
+        force_llm: Whether to judge exact matches instead of scoring them 1.0
+        reuse_responses: Whether to judge the responses in
+            collected_responses.json instead of running the agent again. The
+            file does not record which agent or configuration produced it, so
+            this is only safe when neither has changed since it was collected.
+    """
+    print("=" * 80)
+    print("Tool Selection Accuracy Evaluation")
+    print("=" * 80)
+
+    # Load ground truth
+    eval_dir = Path(__file__).parent
+    ground_truth_file = eval_dir / "ground_truth.json"
+    ground_truth = load_ground_truth(ground_truth_file)
+
+    print(f"\nLoaded {len(ground_truth)} test cases from {ground_truth_file}")
+
+    # Optionally reuse responses from collect_responses.py instead of
+    # re-running the agent; cases without a usable response are run again
+    responses_file = eval_dir / "collected_responses.json"
+    collected_by_id = (load_reusable_responses(responses_file, ground_truth_file)
+                       if reuse_responses else {})
+    to_run = sum(idx not in collected_by_id
+                 for idx in range(1, len(ground_truth) + 1))
+
+    agent = None
+    if to_run:
+        if collected_by_id:
+            print(f"\nReusing collected responses from {responses_file}; "
+                  f"running the agent on the other {to_run} test cases")
+        # Create agent
+        print("\nInitializing agent...")
+        agent = create_mcp_orchestrator()
+    else:
+        print(f"\nUsing collected responses from {responses_file}")
+
+    # Create Azure OpenAI client for evaluation
+    print("Initializing Azure OpenAI evaluator client...")
+    eval_client = get_openai_client(
+        settings.endpoint,
+        # The SDK retries 429s, timeouts and 5xx with exponential backoff
+        max_retries=int(os.getenv("EVAL_MAX_RETRIES", "5"))
+    )
+
+    # Run test cases concurrently, streaming each result to
+    # tool_selection_results.jsonl as soon as it is ready. The names differ
+    # from evaluate.py's outputs so the two scripts never overwrite each other.
+    semaphore = asyncio.Semaphore(int(os.getenv("EVAL_CONCURRENCY", "8")))
+    results_file = eval_dir / "tool_selection_results.jsonl"
+
+    with results_file.open('wb') as results_out:
+        async def run_and_record(idx: int, test_case: dict[str, Any]) -> dict[str, Any]:
+            result = await _run_case(agent, eval_client, idx, len(ground_truth),
+                                     test_case, semaphore,
+                                     collected_by_id.get(idx), force_llm)
+            results_out.write(orjson.dumps(result) + b"\n")
+            results_out.flush()
+            return result
+
+        # gather keeps the returned results in test case order
+        results = await asyncio.gather(
+            *(run_and_record(idx, test_case)
+              for idx, test_case in enumerate(ground_truth, 1)))
+
+    # Save the agent responses next to the results. collected_responses.json
+    # belongs to collect_responses.py and is never rewritten here.
+    if to_run:
+        timestamp = datetime.now().isoformat()
+        (eval_dir / "tool_selection_responses.json").write_bytes(orjson.dumps([
+            {
+                'test_case_id': r['test_case_id'],
+                'query': r['query'],
+                'expected_tools': r['expected_tools'],
+                'expected_tool_args': test_case.get('expected_tool_args', {}),
+                **({'error': r['error']} if 'error' in r else {
+                    'actual_tool_calls': r['actual_tool_calls'],
+                    'response': r['response']
+                }),
+                'timestamp': collected_by_id.get(
+                    r['test_case_id'], {}).get('timestamp', timestamp)
+            }
+            for r, test_case in zip(results, ground_truth)
+        ], option=orjson.OPT_INDENT_2))
 
     # Calculate aggregate metrics
     print(f"\n{'=' * 80}")
@@ -319,39 +378,67 @@ async def run_evaluation():
     print(f"{'=' * 80}")
 
     successful_results = [r for r in results if 'error' not in r]
+    metrics: dict[str, Any] = {}
 
     if successful_results:
-        avg_precision = sum(r['manual_evaluation']['precision']
-                            for r in successful_results) / len(successful_results)
-        avg_recall = sum(r['manual_evaluation']['recall']
-                         for r in successful_results) / len(successful_results)
-        avg_f1 = sum(r['manual_evaluation']['f1_score']
-                     for r in successful_results) / len(successful_results)
-        exact_match_rate = sum(
-            1 for r in successful_results if r['manual_evaluation']['exact_match']) / len(successful_results)
-        avg_llm_score = sum(r['llm_evaluation'].get('overall_score', 0)
-                            for r in successful_results) / len(successful_results)
+        # Accumulate every metric in a single pass over the results
+        total_precision = total_recall = total_f1 = total_llm_score = 0.0
+        exact_match_count = 0
+        for r in successful_results:
+            manual_eval = r['manual_evaluation']
+            total_precision += manual_eval['precision']
+            total_recall += manual_eval['recall']
+            total_f1 += manual_eval['f1_score']
+            exact_match_count += manual_eval['exact_match']
+            total_llm_score += r['llm_evaluation'].get('overall_score', 0)
+
+        count = len(successful_results)
+        metrics = {
+            'test_cases': count,
+            'average_precision': total_precision / count,
+            'average_recall': total_recall / count,
+            'average_f1_score': total_f1 / count,
+            'exact_match_rate': exact_match_count / count,
+            'average_llm_overall_score': total_llm_score / count
+        }
 
         print(
-            f"\nManual Metrics (averaged over {len(successful_results)} test cases):")
-        print(f"  Average Precision: {avg_precision:.2%}")
-        print(f"  Average Recall: {avg_recall:.2%}")
-        print(f"  Average F1 Score: {avg_f1:.2%}")
-        print(f"  Exact Match Rate: {exact_match_rate:.2%}")
+            f"\nManual Metrics (averaged over {count} test cases):")
+        print(f"  Average Precision: {metrics['average_precision']:.2%}")
+        print(f"  Average Recall: {metrics['average_recall']:.2%}")
+        print(f"  Average F1 Score: {metrics['average_f1_score']:.2%}")
+        print(f"  Exact Match Rate: {metrics['exact_match_rate']:.2%}")
 
         print("\nLLM-based Metrics:")
-        print(f"  Average Overall Score: {avg_llm_score:.2%}")
-
-    # Save detailed results
-    results_file = eval_dir / "eval_results.json"
-    with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2)
+        print(
+            f"  Average Overall Score: {metrics['average_llm_overall_score']:.2%}")
+
+    # Save the aggregate rollup next to the per-case results
+    summary_file = eval_dir / "tool_selection_results.json"
+    summary_file.write_bytes(orjson.dumps({
+        'evaluation_timestamp': datetime.now(timezone.utc).isoformat(),
+        'total_test_cases': len(results),
+        'successful_evaluations': len(successful_results),
+        'metrics': metrics,
+        'results_file': results_file.name
+    }, option=orjson.OPT_INDENT_2))
 
     print(f"\n\nDetailed results saved to: {results_file}")
+    print(f"Aggregate metrics saved to: {summary_file}")
     print(f"{'=' * 80}\n")
 
+    # Release the shared connection pool used by the judge (and agent)
+    await close_clients()
+
     return results
 
 
 if __name__ == "__main__":
-    asyncio.run(run_evaluation())
+    import sys
+
+    from rc_agent.event_loop import run
+
+    force_llm = "--force-llm" in sys.argv
+    reuse_responses = "--reuse-responses" in sys.argv
+
+    run(run_evaluation(force_llm=force_llm, reuse_responses=reuse_responses))
@@ -6,23 +6,130 @@ from the agent runner. It supports both manual metrics and LLM-based evaluation.
 """
 
 import os
-import json
+import asyncio
+import hashlib
+import orjson
+from collections import Counter
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Final
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 
+from rc_agent.azure_clients import close_clients, get_openai_client
 from rc_agent.config.settings import settings
 
 # Load environment variables
 load_dotenv()
 
+# Batch judging only pays off once there are enough test cases
+_BATCH_MIN_CASES = 100
+_BATCH_POLL_SECONDS = 30
+_BATCH_TERMINAL_STATUSES = frozenset(
+    {"completed", "failed", "expired", "cancelled"})
+
+# Judge calls are deterministic (temperature=0), so reruns can reuse them
+_JUDGE_CACHE_DIR = Path(__file__).parent / ".judge_cache"
+_judge_cache_stats: Counter = Counter()
+
+# Tool definitions shown to the evaluator
+_TOOL_DEFINITIONS: Final[list[dict[str, Any]]] = [
+    {
+        "name": "get_pipeline_status",
+        "description": (
+            "Get the status of a deployment pipeline for a specific service "
+            "and environment"
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "service": {
+                    "type": "string",
+                    "description": "The service name (e.g., 'payments', 'checkout')"
+                },
+                "environment": {
+                    "type": "string",
+                    "description": "The environment (e.g., 'prod', 'staging')"
+                }
+            },
+            "required": ["service", "environment"]
+        }
+    },
+    {
+        "name": "get_job_logs",
+        "description": (
+            "Get the logs from a specific job to understand what happened "
+            "during execution"
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "The job ID to retrieve logs for (e.g., 'job-789')"
+                }
+            },
+            "required": ["job_id"]
+        }
+    }
+]
+
+# The tool definitions never change, so serialize them once. Compact JSON
+# reads just as well to the judge and keeps the prompt small.
+_TOOL_DEFINITIONS_JSON: Final[str] = orjson.dumps(_TOOL_DEFINITIONS).decode()
+
+# Recorded instead of calling the judge when the agent picked exactly the
+# expected tools; pass --force-llm to judge every case anyway
+EXACT_MATCH_EVALUATION: Final[dict[str, Any]] = {
+    "correctness_score": 1.0,
+    "completeness_score": 1.0,
+    "efficiency_score": 1.0,
+    "overall_score": 1.0,
+    "reasoning": "exact_match short-circuit"
+}
+
+# The judge prompt for both evaluation scripts. Changing it changes the LLM
+# scores, so results are only comparable between runs on the same prompt.
+_JUDGE_SYSTEM_MESSAGE: Final[str] = (
+    "You are an expert AI evaluator. Respond only with valid JSON.")
+
+_JUDGE_PROMPT_TEMPLATE: Final[str] = """\
+You are an expert evaluator for AI agent tool selection.
+
+Evaluate whether the agent selected the appropriate tools for the given user query.
+
+User Query: "{query}"
+
+Available Tools:
+{tool_definitions}
+
+Expected Tools: {expected_tools}
+
+Actual Tool Calls:
+{tool_calls}
+
+Agent Response:
+{response}
+
+Evaluate the tool selection on the following criteria:
+1. Correctness: Did the agent select the right tools for the query? (0-1)
+2. Completeness: Were all necessary tools selected? (0-1)
+3. Efficiency: Were any unnecessary tools selected? (0-1)
+
+Provide your evaluation in JSON format:
+{{
+    "correctness_score": <float 0-1>,
+    "completeness_score": <float 0-1>,
+    "efficiency_score": <float 0-1>,
+    "overall_score": <float 0-1>,
+    "reasoning": "<brief explanation>"
+}}
+"""
+
 
 def load_collected_responses(file_path: Path) -> list[dict[str, Any]]:
     """Load pre-collected agent responses."""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    return orjson.loads(file_path.read_bytes())
 
 
 def evaluate_tool_selection_manual(
@@ -39,15 +146,13 @@ def evaluate_tool_selection_manual(
     Returns:
         dict with evaluation metrics
     """
-    actual_tools = [tc.get('name')
-                    for tc in actual_tool_calls if tc.get('name')]
-
     # Check if all expected tools were called
-    expected_set = set(expected_tools)
-    actual_set = set(actual_tools)
+    expected_set = frozenset(expected_tools)
+    actual_set = frozenset(
+        name for name in (tc.get('name') for tc in actual_tool_calls) if name)
 
     # Calculate metrics
-    correct_tools = expected_set.intersection(actual_set)
+    correct_tools = expected_set & actual_set
     missing_tools = expected_set - actual_set
     extra_tools = actual_set - expected_set
 
@@ -69,112 +174,333 @@ def evaluate_tool_selection_manual(
         'recall': recall,
         'f1_score': f1,
         'exact_match': exact_match,
-        'expected_tools': sorted(list(expected_set)),
-        'actual_tools': sorted(list(actual_set)),
-        'correct_tools': sorted(list(correct_tools)),
-        'missing_tools': sorted(list(missing_tools)),
-        'extra_tools': sorted(list(extra_tools))
+        'expected_tools': sorted(expected_set),
+        'actual_tools': sorted(actual_set),
+        'correct_tools': sorted(correct_tools),
+        'missing_tools': sorted(missing_tools),
+        'extra_tools': sorted(extra_tools)
     }
 
 
-def evaluate_with_llm(
-    client: AzureOpenAI,
+def build_judge_messages(
     query: str,
     response: str,
     tool_calls: list[dict[str, Any]],
     expected_tools: list[str]
-) -> dict[str, Any]:
+) -> list[dict[str, str]]:
     """
-    Use Azure OpenAI to evaluate tool selection quality.
+    Build the chat messages sent to the LLM judge for one test case.
 
     Args:
-        client: AzureOpenAI client instance
         query: User query
         response: Agent response
         tool_calls: List of tool calls made
         expected_tools: Expected tools that should have been called
 
     Returns:
-        dict with LLM-based evaluation results
+        list of chat messages for the judge completion
     """
-    tool_definitions = [
-        {
-            "name": "get_pipeline_status",
-            "description": "Get the status of a deployment pipeline for a specific service and environment"
-        },
-        {
-            "name": "get_job_logs",
-            "description": "Get the logs from a specific job to understand what happened during execution"
-        }
+    evaluation_prompt = _JUDGE_PROMPT_TEMPLATE.format(
+        query=query,
+        tool_definitions=_TOOL_DEFINITIONS_JSON,
+        expected_tools=', '.join(expected_tools),
+        tool_calls=orjson.dumps(tool_calls).decode(),
+        response=response
+    )
+
+    return [
+        {"role": "system", "content": _JUDGE_SYSTEM_MESSAGE},
+        {"role": "user", "content": evaluation_prompt}
     ]
 
-    evaluation_prompt = f"""You are an expert evaluator for AI agent tool selection.
 
-Evaluate whether the agent selected the appropriate tools for the given user query.
+def judge_failure(reason: str) -> dict[str, Any]:
+    """Build the zero-score evaluation recorded when a judge call fails."""
+    return {
+        "error": reason,
+        "correctness_score": 0.0,
+        "completeness_score": 0.0,
+        "efficiency_score": 0.0,
+        "overall_score": 0.0,
+        "reasoning": f"Evaluation failed: {reason}"
+    }
 
-User Query: "{query}"
 
-Available Tools:
-{json.dumps(tool_definitions, indent=2)}
+def _judge_cache_key(model: str | None, messages: list[dict[str, str]]) -> str:
+    """Content address of a judge request: SHA-256 over model and prompt."""
+    payload = orjson.dumps({
+        "model": model,
+        "messages": messages,
+        "response_format": "json_object"
+    }, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
 
-Expected Tools: {', '.join(expected_tools)}
 
-Actual Tool Calls:
-{json.dumps(tool_calls, indent=2)}
+async def evaluate_with_llm(
+    client: AsyncAzureOpenAI,
+    query: str,
+    response: str,
+    tool_calls: list[dict[str, Any]],
+    expected_tools: list[str],
+    use_cache: bool = True
+) -> dict[str, Any]:
+    """
+    Use Azure OpenAI to evaluate tool selection quality.
 
-Agent Response:
-{response}
+    Successful judgements are cached on disk under _JUDGE_CACHE_DIR, keyed by
+    the request content, so reruns skip identical judge calls.
 
-Evaluate the tool selection on the following criteria:
-1. Correctness: Did the agent select the right tools for the query? (0-1)
-2. Completeness: Were all necessary tools selected? (0-1)
-3. Efficiency: Were any unnecessary tools selected? (0-1)
+    Args:
+        client: AsyncAzureOpenAI client instance
+        query: User query
+        response: Agent response
+        tool_calls: List of tool calls made
+        expected_tools: Expected tools that should have been called
+        use_cache: Whether to read and write the judge cache
 
-Provide your evaluation in JSON format:
-{{
-    "correctness_score": <float 0-1>,
-    "completeness_score": <float 0-1>,
-    "efficiency_score": <float 0-1>,
-    "overall_score": <float 0-1>,
-    "reasoning": "<brief explanation>"
-}}
-"""
+    Returns:
+        dict with LLM-based evaluation results
+    """
+    model = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+    messages = build_judge_messages(
+        query, response, tool_calls, expected_tools)
+
+    cache_file = None
+    if use_cache:
+        cache_file = _JUDGE_CACHE_DIR / \
+            f"{_judge_cache_key(model, messages)}.json"
+        try:
+            result = orjson.loads(cache_file.read_bytes())
+            _judge_cache_stats['hits'] += 1
+            return result
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            _judge_cache_stats['misses'] += 1
 
     try:
-        eval_response = client.chat.completions.create(
-            model=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
-            messages=[
-                {"role": "system", "content": "You are an expert AI evaluator. Respond only with valid JSON."},
-                {"role": "user", "content": evaluation_prompt}
-            ],
+        eval_response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
             temperature=0,
             response_format={"type": "json_object"}
         )
 
-        result = json.loads(eval_response.choices[0].message.content)
-        return result
+        result = orjson.loads(eval_response.choices[0].message.content)
     except Exception as e:
+        return judge_failure(str(e))
+
+    if cache_file is not None:
+        # Write then rename so concurrent runs never see a partial file
+        _JUDGE_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(orjson.dumps(result))
+        os.replace(tmp_file, cache_file)
+
+    return result
+
+
+async def evaluate_with_batch(
+    client: AsyncAzureOpenAI,
+    collected_data: list[dict[str, Any]]
+) -> dict[str, dict[str, Any]]:
+    """
+    Judge all collected responses in one Azure OpenAI Batch API job.
+
+    Batch jobs are billed at a discount and are not subject to the online
+    rate limits, but complete asynchronously, so this polls until the job
+    reaches a terminal state.
+
+    Args:
+        client: AsyncAzureOpenAI client instance
+        collected_data: Collected responses to judge; entries with errors are skipped
+
+    Returns:
+        dict mapping str(test_case_id) to its LLM-based evaluation
+    """
+    requests = [
+        orjson.dumps({
+            "custom_id": str(data_point['test_case_id']),
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+                "messages": build_judge_messages(
+                    data_point['query'],
+                    data_point.get('response', ''),
+                    data_point.get('actual_tool_calls', []),
+                    data_point['expected_tools']
+                ),
+                "temperature": 0,
+                "response_format": {"type": "json_object"}
+            }
+        })
+        for data_point in collected_data if 'error' not in data_point
+    ]
+
+    batch_file = await client.files.create(
+        file=("judge_batch.jsonl", b"\n".join(requests)),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(requests)} judge requests")
+
+    while batch.status not in _BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(_BATCH_POLL_SECONDS)
+        batch = await client.batches.retrieve(batch.id)
+        print(f"  Batch {batch.id}: {batch.status}")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"⚠ Warning: Batch {batch.id} ended with status {batch.status}")
+        return {}
+
+    output = await client.files.content(batch.output_file_id)
+    evaluations = {}
+    for line in output.content.splitlines():
+        if not line.strip():
+            continue
+        item = orjson.loads(line)
+        try:
+            content = item['response']['body']['choices'][0]['message']['content']
+            evaluations[item['custom_id']] = orjson.loads(content)
+        except (KeyError, IndexError, TypeError, orjson.JSONDecodeError) as e:
+            evaluations[item['custom_id']] = judge_failure(
+                str(item.get('error') or e))
+    return evaluations
+
+
+async def _evaluate_case(
+    eval_client: AsyncAzureOpenAI | None,
+    data_point: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    batch_evaluations: dict[str, dict[str, Any]] | None = None,
+    use_cache: bool = True,
+    force_llm: bool = False
+) -> dict[str, Any]:
+    """
+    Evaluate a single collected response.
+
+    The report for the test case is printed in one block once it finishes so
+    output from concurrently judged cases does not interleave.
+
+    Args:
+        eval_client: AsyncAzureOpenAI judge client, or None for manual only
+        data_point: Collected response for one test case
+        semaphore: Bounds how many judge calls run at once
+        batch_evaluations: Judge results from a batch job, if one was run
+        use_cache: Whether online judge calls use the judge cache
+        force_llm: Whether to judge exact matches instead of short-circuiting
+
+    Returns:
+        dict with the evaluation result for the test case
+    """
+    test_case_id = data_point['test_case_id']
+    query = data_point['query']
+    expected_tools = data_point['expected_tools']
+    actual_tool_calls = data_point.get('actual_tool_calls', [])
+    response = data_point.get('response', '')
+
+    lines = [
+        f"\n{'=' * 80}",
+        f"Evaluating Test Case {test_case_id}",
+        f"Query: {query}",
+        f"Expected Tools: {expected_tools}",
+    ]
+
+    if 'error' in data_point:
+        lines.append(
+            f"⚠ Skipping - Error in collection: {data_point['error']}")
+        print("\n".join(lines))
         return {
-            "error": str(e),
-            "correctness_score": 0.0,
-            "completeness_score": 0.0,
-            "efficiency_score": 0.0,
-            "overall_score": 0.0,
-            "reasoning": f"Evaluation failed: {str(e)}"
+            'test_case_id': test_case_id,
+            'query': query,
+            'error': data_point['error'],
+            'skipped': True
         }
 
+    # Manual evaluation
+    manual_eval = evaluate_tool_selection_manual(
+        expected_tools, actual_tool_calls)
+
+    lines.append("\nActual Tool Calls:")
+    for tc in actual_tool_calls:
+        lines.append(
+            f"  - {tc.get('name', 'unknown')}: {tc.get('arguments', {})}")
+
+    lines.append("\nManual Evaluation:")
+    lines.append(f"  Precision: {manual_eval['precision']:.2%}")
+    lines.append(f"  Recall: {manual_eval['recall']:.2%}")
+    lines.append(f"  F1 Score: {manual_eval['f1_score']:.2%}")
+    lines.append(
+        f"  Exact Match: {'✓' if manual_eval['exact_match'] else '✗'}")
+
+    result = {
+        'test_case_id': test_case_id,
+        'query': query,
+        'expected_tools': expected_tools,
+        'actual_tool_calls': actual_tool_calls,
+        'manual_evaluation': manual_eval,
+        'response': response
+    }
+
+    # LLM evaluation
+    llm_eval = None
+    if eval_client and manual_eval['exact_match'] and not force_llm:
+        llm_eval = dict(EXACT_MATCH_EVALUATION)
+    elif eval_client and not response:
+        # Nothing for the judge to read
+        llm_eval = judge_failure("No agent response to judge")
+    elif batch_evaluations is not None:
+        llm_eval = batch_evaluations.get(
+            str(test_case_id), judge_failure("Missing from batch output"))
+    elif eval_client:
+        async with semaphore:
+            llm_eval = await evaluate_with_llm(
+                eval_client,
+                query,
+                response,
+                actual_tool_calls,
+                expected_tools,
+                use_cache=use_cache
+            )
+
+    if llm_eval is not None:
+        result['llm_evaluation'] = llm_eval
+
+        lines.append("\nLLM Evaluation:")
+        lines.append(
+            f"  Overall Score: {llm_eval.get('overall_score', 0):.2%}")
+        lines.append(f"  Reasoning: {llm_eval.get('reasoning', 'N/A')}")
 
-def run_evaluation(use_llm: bool = True):
+    print("\n".join(lines))
+    return result
+
+
+async def run_evaluation(
+    use_llm: bool = True,
+    use_batch: bool = False,
+    use_cache: bool = True,
+    force_llm: bool = False
+):
     """
     Main evaluation function.
 
     Args:
         use_llm: Whether to use LLM-based evaluation (requires Azure OpenAI)
+        use_batch: Whether to judge through the Batch API; only used for runs
+            of at least _BATCH_MIN_CASES test cases
+        use_cache: Whether online judge calls reuse cached judgements
+        force_llm: Whether to judge exact matches instead of scoring them 1.0
     """
     print("=" * 80)
     print("Tool Selection Accuracy Evaluation")
     print("=" * 80)
 
+    # Judge cache stats are reported per run
+    _judge_cache_stats.clear()
+
     # Load collected responses
     eval_dir = Path(__file__).parent
     responses_file = eval_dir / "collected_responses.json"
@@ -194,12 +520,10 @@ def run_evaluation(use_llm: bool = True):
     if use_llm:
         print("\nInitializing Azure OpenAI evaluator client...")
         try:
-            eval_client = AzureOpenAI(
-                api_version="2024-10-21",
-                azure_endpoint=settings.endpoint,
-                azure_ad_token_provider=lambda: DefaultAzureCredential().get_token(
-                    "https://cognitiveservices.azure.com/.default"
-                ).token
+            eval_client = get_openai_client(
+                settings.endpoint,
+                # The SDK retries 429s, timeouts and 5xx with exponential backoff
+                max_retries=int(os.getenv("EVAL_MAX_RETRIES", "5"))
             )
             print("✓ LLM evaluator initialized")
         except Exception as e:
@@ -207,70 +531,45 @@ def run_evaluation(use_llm: bool = True):
             print("Continuing with manual evaluation only...")
             use_llm = False
 
-    # Run evaluation
-    results = []
-
-    for data_point in collected_data:
-        test_case_id = data_point['test_case_id']
-        query = data_point['query']
-        expected_tools = data_point['expected_tools']
-        actual_tool_calls = data_point.get('actual_tool_calls', [])
-        response = data_point.get('response', '')
-
-        print(f"\n{'=' * 80}")
-        print(f"Evaluating Test Case {test_case_id}")
-        print(f"Query: {query}")
-        print(f"Expected Tools: {expected_tools}")
-
-        if 'error' in data_point:
-            print(f"⚠ Skipping - Error in collection: {data_point['error']}")
-            results.append({
-                'test_case_id': test_case_id,
-                'query': query,
-                'error': data_point['error'],
-                'skipped': True
-            })
-            continue
-
-        # Manual evaluation
-        manual_eval = evaluate_tool_selection_manual(
-            expected_tools, actual_tool_calls)
-
-        print("\nActual Tool Calls:")
-        for tc in actual_tool_calls:
-            print(f"  - {tc.get('name', 'unknown')}: {tc.get('arguments', {})}")
-
-        print("\nManual Evaluation:")
-        print(f"  Precision: {manual_eval['precision']:.2%}")
-        print(f"  Recall: {manual_eval['recall']:.2%}")
-        print(f"  F1 Score: {manual_eval['f1_score']:.2%}")
-        print(f"  Exact Match: {'✓' if manual_eval['exact_match'] else '✗'}")
-
-        result = {
-            'test_case_id': test_case_id,
-            'query': query,
-            'expected_tools': expected_tools,
-            'actual_tool_calls': actual_tool_calls,
-            'manual_evaluation': manual_eval,
-            'response': response
-        }
-
-        # LLM evaluation
-        if use_llm and eval_client:
-            llm_eval = evaluate_with_llm(
-                eval_client,
-                query,
-                response,
-                actual_tool_calls,
-                expected_tools
-            )
-            result['llm_evaluation'] = llm_eval
-
-            print("\nLLM Evaluation:")
-            print(f"  Overall Score: {llm_eval.get('overall_score', 0):.2%}")
-            print(f"  Reasoning: {llm_eval.get('reasoning', 'N/A')}")
-
-        results.append(result)
+    batch_evaluations = None
+    if use_llm and use_batch:
+        # Only cases that reach the judge count towards the batch threshold;
+        # errored and empty responses are skipped, exact matches short-circuit
+        to_judge = [
+            data_point for data_point in collected_data
+            if 'error' not in data_point and data_point.get('response')
+            and (force_llm or not evaluate_tool_selection_manual(
+                data_point['expected_tools'],
+                data_point.get('actual_tool_calls', []))['exact_match'])
+        ]
+        if len(to_judge) >= _BATCH_MIN_CASES:
+            print("\nJudging responses with the Batch API...")
+            batch_evaluations = await evaluate_with_batch(
+                eval_client, to_judge)
+        else:
+            print(f"\nFewer than {_BATCH_MIN_CASES} test cases, "
+                  "judging online instead of with the Batch API")
+
+    # Judge test cases concurrently, streaming each result to
+    # eval_results.jsonl as soon as it is ready
+    semaphore = asyncio.Semaphore(int(os.getenv("EVAL_CONCURRENCY", "8")))
+    results_file = eval_dir / "eval_results.jsonl"
+
+    with results_file.open('wb') as results_out:
+        async def evaluate_and_record(data_point: dict[str, Any]) -> dict[str, Any]:
+            result = await _evaluate_case(eval_client, data_point, semaphore,
+                                          batch_evaluations, use_cache, force_llm)
+            results_out.write(orjson.dumps(result) + b"\n")
+            results_out.flush()
+            return result
+
+        # gather keeps the returned results in input order
+        results = await asyncio.gather(
+            *(evaluate_and_record(data_point) for data_point in collected_data))
+
+    if _judge_cache_stats:
+        print(f"\nJudge cache: {_judge_cache_stats['hits']} hits, "
+              f"{_judge_cache_stats['misses']} misses")
 
     # Calculate aggregate metrics
     print(f"\n{'=' * 80}")
@@ -278,63 +577,91 @@ def run_evaluation(use_llm: bool = True):
     print(f"{'=' * 80}")
 
     successful_results = [r for r in results if not r.get('skipped', False)]
+    metrics: dict[str, Any] = {}
 
     if successful_results:
-        avg_precision = sum(r['manual_evaluation']['precision']
-                            for r in successful_results) / len(successful_results)
-        avg_recall = sum(r['manual_evaluation']['recall']
-                         for r in successful_results) / len(successful_results)
-        avg_f1 = sum(r['manual_evaluation']['f1_score']
-                     for r in successful_results) / len(successful_results)
-        exact_match_count = sum(
-            1 for r in successful_results if r['manual_evaluation']['exact_match'])
-        exact_match_rate = exact_match_count / len(successful_results)
+        # Accumulate every metric in a single pass over the results
+        totals: Counter = Counter()
+        llm_count = 0
+        for r in successful_results:
+            manual_eval = r['manual_evaluation']
+            totals['precision'] += manual_eval['precision']
+            totals['recall'] += manual_eval['recall']
+            totals['f1_score'] += manual_eval['f1_score']
+            totals['exact_match'] += manual_eval['exact_match']
+
+            llm_eval = r.get('llm_evaluation')
+            if llm_eval is not None:
+                llm_count += 1
+                for key in ('overall_score', 'correctness_score',
+                            'completeness_score', 'efficiency_score'):
+                    totals[key] += llm_eval.get(key, 0)
+
+        count = len(successful_results)
+        manual = metrics['manual'] = {
+            'test_cases': count,
+            'average_precision': totals['precision'] / count,
+            'average_recall': totals['recall'] / count,
+            'average_f1_score': totals['f1_score'] / count,
+            'exact_match_count': totals['exact_match'],
+            'exact_match_rate': totals['exact_match'] / count
+        }
 
         print(
-            f"\nManual Metrics (averaged over {len(successful_results)} test cases):")
-        print(f"  Average Precision: {avg_precision:.2%}")
-        print(f"  Average Recall: {avg_recall:.2%}")
-        print(f"  Average F1 Score: {avg_f1:.2%}")
+            f"\nManual Metrics (averaged over {count} test cases):")
+        print(f"  Average Precision: {manual['average_precision']:.2%}")
+        print(f"  Average Recall: {manual['average_recall']:.2%}")
+        print(f"  Average F1 Score: {manual['average_f1_score']:.2%}")
         print(
-            f"  Exact Match Rate: {exact_match_rate:.2%} ({exact_match_count}/{len(successful_results)})")
-
-        if use_llm and eval_client:
-            llm_results = [
-                r for r in successful_results if 'llm_evaluation' in r]
-            if llm_results:
-                avg_llm_score = sum(r['llm_evaluation'].get(
-                    'overall_score', 0) for r in llm_results) / len(llm_results)
-                avg_correctness = sum(r['llm_evaluation'].get(
-                    'correctness_score', 0) for r in llm_results) / len(llm_results)
-                avg_completeness = sum(r['llm_evaluation'].get(
-                    'completeness_score', 0) for r in llm_results) / len(llm_results)
-                avg_efficiency = sum(r['llm_evaluation'].get(
-                    'efficiency_score', 0) for r in llm_results) / len(llm_results)
-
-                print(
-                    f"\nLLM-based Metrics (averaged over {len(llm_results)} test cases):")
-                print(f"  Average Overall Score: {avg_llm_score:.2%}")
-                print(f"  Average Correctness: {avg_correctness:.2%}")
-                print(f"  Average Completeness: {avg_completeness:.2%}")
-                print(f"  Average Efficiency: {avg_efficiency:.2%}")
-
-    # Save detailed results
-    results_file = eval_dir / "eval_results.json"
-    with open(results_file, 'w') as f:
-        json.dump({
-            'evaluation_timestamp': Path(__file__).stem,
-            'total_test_cases': len(results),
-            'successful_evaluations': len(successful_results),
-            'results': results
-        }, f, indent=2)
+            f"  Exact Match Rate: {manual['exact_match_rate']:.2%} "
+            f"({manual['exact_match_count']}/{count})")
+
+        if llm_count:
+            llm = metrics['llm'] = {
+                'test_cases': llm_count,
+                'average_overall_score': totals['overall_score'] / llm_count,
+                'average_correctness': totals['correctness_score'] / llm_count,
+                'average_completeness': totals['completeness_score'] / llm_count,
+                'average_efficiency': totals['efficiency_score'] / llm_count
+            }
+
+            print(
+                f"\nLLM-based Metrics (averaged over {llm_count} test cases):")
+            print(f"  Average Overall Score: {llm['average_overall_score']:.2%}")
+            print(f"  Average Correctness: {llm['average_correctness']:.2%}")
+            print(f"  Average Completeness: {llm['average_completeness']:.2%}")
+            print(f"  Average Efficiency: {llm['average_efficiency']:.2%}")
+
+    # Save the aggregate rollup next to the per-case results
+    summary_file = eval_dir / "eval_results.json"
+    summary_file.write_bytes(orjson.dumps({
+        'evaluation_timestamp': datetime.now(timezone.utc).isoformat(),
+        'total_test_cases': len(results),
+        'successful_evaluations': len(successful_results),
+        'metrics': metrics,
+        'results_file': results_file.name
+    }, option=orjson.OPT_INDENT_2))
 
     print(f"\n\nDetailed results saved to: {results_file}")
+    print(f"Aggregate metrics saved to: {summary_file}")
     print(f"{'=' * 80}\n")
 
+    # Release the shared connection pool used by the judge (and agent)
+    await close_clients()
+
     return results
 
 
 if __name__ == "__main__":
     import sys
+
+    from rc_agent.event_loop import run
+
     use_llm = "--no-llm" not in sys.argv
-    run_evaluation(use_llm=use_llm)
+    use_batch = "--batch" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    force_llm = "--force-llm" in sys.argv
+
+    run(run_evaluation(
+        use_llm=use_llm, use_batch=use_batch, use_cache=use_cache,
+        force_llm=force_llm))
@@ -0,0 +1,25 @@
+"""Event loop selection for the command-line entry points."""
+
+import asyncio
+import sys
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion on uvloop, or on asyncio where it is unavailable.
+
+    uvloop does not support Windows, which falls back to the default loop.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    if sys.platform != "win32":
+        import uvloop
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -1,8 +1,7 @@
 """FastMCP Server for Job Logs Tool."""
 
-import json
 from fastmcp import FastMCP
-from rc_agent.config.settings import settings
+from rc_agent.services import default_logs_service
 
 # Create FastMCP server instance
 mcp = FastMCP("job-logs-server")
@@ -18,32 +17,7 @@ def _get_job_logs_impl(job_id: str) -> dict:
     Returns:
         dict: Job logs information
     """
-    # Read logs data
-    logs_file = settings.data_dir / "log.json"
-
-    try:
-        with open(logs_file, 'r') as f:
-            all_logs = json.load(f)
-    except FileNotFoundError:
-        return {
-            "found": False,
-            "error": "Logs data file not found"
-        }
-
-    # Look up the job logs
-    if job_id in all_logs:
-        logs = all_logs[job_id]
-        return {
-            "found": True,
-            "job_id": job_id,
-            "logs": logs
-        }
-
-    # Job not found
-    return {
-        "found": False,
-        "message": f"No logs found for job '{job_id}'"
-    }
+    return default_logs_service.get_job_logs(job_id)
 
 
 # Expose as plain function for direct imports
@@ -66,5 +40,7 @@ def get_job_logs_tool(job_id: str) -> dict:
 
 
 if __name__ == "__main__":
-    # Run with SSE transport on HTTP
-    mcp.run(transport="sse", port=8002)
+    from rc_agent.event_loop import run
+
+    # Run with SSE transport on HTTP, on uvloop where available
+    run(mcp.run_async(transport="sse", port=8002))
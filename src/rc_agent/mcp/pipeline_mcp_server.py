@@ -1,8 +1,7 @@
 """FastMCP Server for Pipeline Status Tool."""
 
-import json
 from fastmcp import FastMCP
-from rc_agent.config.settings import settings
+from rc_agent.services import default_pipeline_service
 
 # Create FastMCP server instance
 mcp = FastMCP("pipeline-status-server")
@@ -19,36 +18,7 @@ def _get_pipeline_status_impl(service: str, environment: str) -> dict:
     Returns:
         dict: Pipeline status information
     """
-    # Read pipelines data
-    pipelines_file = settings.data_dir / "pipelines.json"
-
-    try:
-        with open(pipelines_file, 'r') as f:
-            pipelines = json.load(f)
-    except FileNotFoundError:
-        return {
-            "found": False,
-            "error": "Pipelines data file not found"
-        }
-
-    # Search for matching pipeline
-    for pipeline in pipelines:
-        if pipeline.get("service") == service and pipeline.get("environment") == environment:
-            return {
-                "found": True,
-                "status": pipeline.get("status"),
-                "pipeline_id": pipeline.get("pipeline_id"),
-                "branch": pipeline.get("branch"),
-                "started_at": pipeline.get("started_at"),
-                "finished_at": pipeline.get("finished_at"),
-                "failed_job_id": pipeline.get("failed_job_id")
-            }
-
-    # No matching pipeline found
-    return {
-        "found": False,
-        "message": f"No pipeline found for service '{service}' in environment '{environment}'"
-    }
+    return default_pipeline_service.get_pipeline_status(service, environment)
 
 
 # Expose as plain function for direct imports
@@ -72,5 +42,7 @@ def get_pipeline_status_tool(service: str, environment: str) -> dict:
 
 
 if __name__ == "__main__":
-    # Run with SSE transport on HTTP
-    mcp.run(transport="sse", port=8001)
+    from rc_agent.event_loop import run
+
+    # Run with SSE transport on HTTP, on uvloop where available
+    run(mcp.run_async(transport="sse", port=8001))
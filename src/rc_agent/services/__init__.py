@@ -2,5 +2,16 @@
 
 from .pipeline_service import PipelineService
 from .logs_service import LogsService
+from ._json_file import DataFileError
 
-__all__ = ["PipelineService", "LogsService"]
+# Shared instances used by the agent tools and MCP servers
+default_pipeline_service = PipelineService()
+default_logs_service = LogsService()
+
+__all__ = [
+    "PipelineService",
+    "LogsService",
+    "DataFileError",
+    "default_pipeline_service",
+    "default_logs_service",
+]
@@ -0,0 +1,89 @@
+"""Shared JSON data file loading for the services layer."""
+
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Below this size a plain read is cheaper than setting up a mapping
+_MMAP_THRESHOLD_BYTES = 64 * 1024
+
+
+class DataFileError(Exception):
+    """Raised when a service data file is missing or is not valid JSON."""
+
+
+def data_file_not_found(path: Path, label: str) -> DataFileError:
+    """
+    Build the error for a missing data file and log where it was looked for.
+
+    The message returned to tool callers leaves out the path so it does not
+    expose the server's filesystem layout; the path goes to the log instead.
+
+    Args:
+        path: Path to the data file
+        label: Kind of data in the file (e.g., 'pipelines'), for messages
+
+    Returns:
+        DataFileError: The error to raise
+    """
+    logger.warning("%s data file not found: %s", label.capitalize(), path)
+    return DataFileError(f"{label.capitalize()} data file not found")
+
+
+def stat_data_file(path: Path, label: str) -> os.stat_result:
+    """
+    Stat a service data file.
+
+    Args:
+        path: Path to the data file
+        label: Kind of data in the file (e.g., 'pipelines'), for messages
+
+    Returns:
+        os.stat_result: The file's size and modification time
+
+    Raises:
+        DataFileError: If the file does not exist
+    """
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        raise data_file_not_found(path, label) from None
+
+
+def load_json_file(path: Path, size: int, label: str) -> Any:
+    """
+    Parse a JSON data file.
+
+    Large files are memory-mapped and parsed straight from the mapping, so
+    the contents are paged in on demand instead of first being copied into
+    a bytes object.
+
+    Args:
+        path: Path to the JSON file
+        size: File size in bytes, from the caller's stat()
+        label: Kind of data in the file (e.g., 'pipelines'), for messages
+
+    Returns:
+        Any: The parsed JSON document
+
+    Raises:
+        DataFileError: If the file does not exist or is not valid JSON
+    """
+    try:
+        if size < _MMAP_THRESHOLD_BYTES:
+            return orjson.loads(path.read_bytes())
+
+        with open(path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            return orjson.loads(view)
+    except FileNotFoundError:
+        raise data_file_not_found(path, label) from None
+    except orjson.JSONDecodeError as e:
+        raise DataFileError(f"Invalid JSON in {label} data file: {e}") from e
@@ -1,14 +1,58 @@
 """Service for accessing job logs data."""
 
-import json
-from typing import Optional
+import functools
+import os
+import ijson
+from typing import Any, ClassVar, Final, Optional
 from pathlib import Path
 from rc_agent.config.settings import settings
+from rc_agent.services._json_file import (
+    DataFileError,
+    data_file_not_found,
+    load_json_file,
+    stat_data_file,
+)
+
+# Log files larger than this are scanned for the requested job instead of
+# being parsed and kept in memory as a whole
+_STREAMING_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+# Returned for jobs missing from the file; None cannot mark a miss because a
+# job may be present with null logs
+_NOT_FOUND: Final = object()
+
+
+@functools.lru_cache(maxsize=256)
+def _stream_job_logs(path_str: str, mtime_ns: int, job_id: str) -> Any:
+    """
+    Find a single job's logs by streaming the logs file.
+
+    The file is parsed incrementally and the scan stops at the first matching
+    key, so memory stays bounded by the size of one job's logs. Results
+    (including misses) are cached per modification time, so repeated lookups
+    skip the scan.
+
+    Args:
+        path_str: Path to the logs data file
+        mtime_ns: Modification time of the file in nanoseconds
+        job_id: The job ID to retrieve logs for
+
+    Returns:
+        Any: Log lines for the job, or _NOT_FOUND if the job is not in the file
+    """
+    with open(path_str, 'rb') as f:
+        for key, value in ijson.kvitems(f, "", use_float=True):
+            if key == job_id:
+                return value
+    return _NOT_FOUND
 
 
 class LogsService:
     """Service for retrieving job execution logs."""
 
+    # Parsed data shared by every instance: data_file -> (mtime_ns, logs)
+    _cache: ClassVar[dict[Path, tuple[int, dict]]] = {}
+
     def __init__(self, data_file: Optional[Path] = None):
         """
         Initialize the logs service.
@@ -18,6 +62,60 @@ class LogsService:
         """
         self.data_file = data_file or settings.data_dir / "log.json"
 
+    def _ensure_loaded(self, stat: Optional[os.stat_result] = None) -> dict:
+        """
+        Return the parsed logs keyed by job ID.
+
+        The file is only re-read when its modification time changes.
+
+        Args:
+            stat: Result of a stat() the caller already made on the data file
+
+        Returns:
+            dict: Log lines keyed by job ID
+
+        Raises:
+            DataFileError: If the data file is missing or not valid JSON
+        """
+        stat = stat or stat_data_file(self.data_file, "logs")
+        cached = self._cache.get(self.data_file)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+
+        all_logs = load_json_file(self.data_file, stat.st_size, "logs")
+        self._cache[self.data_file] = (stat.st_mtime_ns, all_logs)
+        return all_logs
+
+    def _find_job_logs(self, job_id: str) -> Any:
+        """
+        Return one job's log lines, or _NOT_FOUND if the job has no logs.
+
+        Files above _STREAMING_THRESHOLD_BYTES are streamed instead of being
+        parsed and cached whole.
+
+        Args:
+            job_id: The job ID to retrieve logs for
+
+        Returns:
+            Any: Log lines for the job, or _NOT_FOUND if the job has no logs
+
+        Raises:
+            DataFileError: If the data file is missing, unreadable or not
+                valid JSON
+        """
+        stat = stat_data_file(self.data_file, "logs")
+        if stat.st_size > _STREAMING_THRESHOLD_BYTES:
+            try:
+                return _stream_job_logs(str(self.data_file), stat.st_mtime_ns, job_id)
+            except FileNotFoundError:
+                # Removed between the stat() and the open()
+                raise data_file_not_found(self.data_file, "logs") from None
+            except OSError as e:
+                raise DataFileError(f"Could not read logs data file: {e}") from e
+            except ijson.JSONError as e:
+                raise DataFileError(f"Invalid JSON in logs data file: {e}") from e
+        return self._ensure_loaded(stat).get(job_id, _NOT_FOUND)
+
     def get_job_logs(self, job_id: str) -> dict:
         """
         Retrieve the execution logs for a specific job.
@@ -33,26 +131,19 @@ class LogsService:
                 - error/message (str): Error or informational message if not found
         """
         try:
-            with open(self.data_file, 'r') as f:
-                all_logs = json.load(f)
-        except FileNotFoundError:
-            return {
-                "found": False,
-                "error": f"Logs data file not found: {self.data_file}"
-            }
-        except json.JSONDecodeError as e:
+            logs = self._find_job_logs(job_id)
+        except DataFileError as e:
             return {
                 "found": False,
-                "error": f"Invalid JSON in logs data file: {e}"
+                "error": str(e)
             }
 
-        # Look up the job logs
-        if job_id in all_logs:
-            logs = all_logs[job_id]
+        if logs is not _NOT_FOUND:
+            # Copy so callers cannot modify the cached log lines
             return {
                 "found": True,
                 "job_id": job_id,
-                "logs": logs
+                "logs": list(logs) if isinstance(logs, list) else logs
             }
 
         # Job not found
@@ -69,8 +160,6 @@ class LogsService:
             list: List of all job IDs that have logs
         """
         try:
-            with open(self.data_file, 'r') as f:
-                all_logs = json.load(f)
-                return list(all_logs.keys())
-        except (FileNotFoundError, json.JSONDecodeError):
+            return list(self._ensure_loaded().keys())
+        except DataFileError:
             return []
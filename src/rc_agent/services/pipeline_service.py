@@ -1,14 +1,18 @@
 """Service for accessing pipeline data."""
 
-import json
-from typing import Optional
+from typing import ClassVar, Optional
 from pathlib import Path
 from rc_agent.config.settings import settings
+from rc_agent.services._json_file import DataFileError, load_json_file, stat_data_file
 
 
 class PipelineService:
     """Service for retrieving pipeline status information."""
 
+    # Parsed data shared by every instance:
+    # data_file -> (mtime_ns, pipelines, (service, environment) -> response)
+    _cache: ClassVar[dict[Path, tuple[int, list, dict]]] = {}
+
     def __init__(self, data_file: Optional[Path] = None):
         """
         Initialize the pipeline service.
@@ -18,6 +22,40 @@ class PipelineService:
         """
         self.data_file = data_file or settings.data_dir / "pipelines.json"
 
+    def _ensure_loaded(self) -> tuple[list, dict]:
+        """
+        Return the parsed pipelines and their (service, environment) index.
+
+        The file is only re-read when its modification time changes. The
+        index maps straight to the prebuilt status response for each record.
+
+        Returns:
+            tuple: The pipeline records and the response index
+
+        Raises:
+            DataFileError: If the data file is missing or not valid JSON
+        """
+        stat = stat_data_file(self.data_file, "pipelines")
+        cached = self._cache.get(self.data_file)
+        if cached is not None and cached[0] == stat.st_mtime_ns:
+            return cached[1], cached[2]
+
+        pipelines = load_json_file(self.data_file, stat.st_size, "pipelines")
+        index = {
+            (pipeline.get("service"), pipeline.get("environment")): {
+                "found": True,
+                "status": pipeline.get("status"),
+                "pipeline_id": pipeline.get("pipeline_id"),
+                "branch": pipeline.get("branch"),
+                "started_at": pipeline.get("started_at"),
+                "finished_at": pipeline.get("finished_at"),
+                "failed_job_id": pipeline.get("failed_job_id")
+            }
+            for pipeline in reversed(pipelines)
+        }
+        self._cache[self.data_file] = (stat.st_mtime_ns, pipelines, index)
+        return pipelines, index
+
     def get_pipeline_status(self, service: str, environment: str) -> dict:
         """
         Get the status of a deployment pipeline for a specific service and environment.
@@ -38,31 +76,17 @@ class PipelineService:
                 - error/message (str): Error or informational message if not found
         """
         try:
-            with open(self.data_file, 'r') as f:
-                pipelines = json.load(f)
-        except FileNotFoundError:
-            return {
-                "found": False,
-                "error": f"Pipelines data file not found: {self.data_file}"
-            }
-        except json.JSONDecodeError as e:
+            _, index = self._ensure_loaded()
+        except DataFileError as e:
             return {
                 "found": False,
-                "error": f"Invalid JSON in pipelines data file: {e}"
+                "error": str(e)
             }
 
-        # Search for matching pipeline
-        for pipeline in pipelines:
-            if pipeline.get("service") == service and pipeline.get("environment") == environment:
-                return {
-                    "found": True,
-                    "status": pipeline.get("status"),
-                    "pipeline_id": pipeline.get("pipeline_id"),
-                    "branch": pipeline.get("branch"),
-                    "started_at": pipeline.get("started_at"),
-                    "finished_at": pipeline.get("finished_at"),
-                    "failed_job_id": pipeline.get("failed_job_id")
-                }
+        # Look up the matching pipeline; copy so callers cannot alter the cache
+        response = index.get((service, environment))
+        if response is not None:
+            return dict(response)
 
         # No matching pipeline found
         return {
@@ -78,7 +102,7 @@ class PipelineService:
             list: List of all pipeline records
         """
         try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            pipelines, _ = self._ensure_loaded()
+            return [dict(pipeline) for pipeline in pipelines]
+        except DataFileError:
             return []
@@ -4,19 +4,62 @@ This module provides initialization of OpenTelemetry tracing for CLI-based
 agent applications using Microsoft Agent Framework.
 """
 
+import atexit
+import contextlib
 import os
-import sys
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Sequence
 
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
 from opentelemetry.sdk.resources import Resource
 
 # Global flag to track if tracing has been initialized
 _tracing_initialized = False
+_tracing_lock = threading.Lock()
+
+# Open trace file, kept here so it can be closed/reopened without leaking fds
+_trace_file: Optional[IO[str]] = None
+
+# Sink for Agent Framework's metrics console output, opened on first init
+_devnull: Optional[IO[str]] = None
+
+# Explicit batching limits so a burst of spans can't grow the queue unbounded
+_MAX_QUEUE_SIZE = 2048
+_MAX_EXPORT_BATCH_SIZE = 512
+_SCHEDULE_DELAY_MILLIS = 1000
+
+
+class _JsonLinesSpanExporter(SpanExporter):
+    """Write each span as one compact JSON line, one write per batch."""
+
+    def __init__(self, out: IO[str]):
+        self._out = out
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self._out.write("".join(span.to_json(indent=None) + "\n" for span in spans))
+        self._out.flush()
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def _batch_processor(exporter: SpanExporter) -> BatchSpanProcessor:
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=_MAX_QUEUE_SIZE,
+        max_export_batch_size=_MAX_EXPORT_BATCH_SIZE,
+        schedule_delay_millis=_SCHEDULE_DELAY_MILLIS,
+    )
 
 
 def init_tracing(
@@ -28,17 +71,18 @@ def init_tracing(
 
     This function sets up:
     - A TracerProvider with service.name resource attribute
-    - File exporter for writing traces to a local JSONL file (default)
+    - File exporter writing one compact JSON span per line to a local JSONL file (default)
     - Optional ConsoleSpanExporter for outputting traces to stdout
-    - BatchSpanProcessor for efficient span processing
+    - BatchSpanProcessor with bounded queue and batch sizes
     - Integration with Microsoft Agent Framework observability
 
-    The function is idempotent - calling it multiple times will not
-    re-initialize the tracing infrastructure.
+    The function is idempotent and thread-safe - calling it multiple times,
+    including concurrently, will not re-initialize the tracing infrastructure.
 
     Args:
         output_file: Path to write traces to. If None, a timestamped file will be 
-                    created in the traces/ directory (e.g., traces/trace_20231129_143022.jsonl).
+                    created in the traces/ directory (e.g., traces/trace_20231129_143022_4242.jsonl).
+                    The process ID suffix keeps files from concurrent worker processes apart.
         enable_console: Whether to also output traces to console. Default False.
 
     Returns:
@@ -55,69 +99,69 @@ def init_tracing(
         >>> # Write to custom file location
         >>> tracer = init_tracing(output_file="logs/my_trace.jsonl")
     """
-    global _tracing_initialized
+    global _tracing_initialized, _trace_file, _devnull
 
     if _tracing_initialized:
         # Already initialized, just return a tracer
         return trace.get_tracer("release-copilot-agent")
 
-    # Create our TracerProvider FIRST before calling setup_observability
-    resource = Resource.create({"service.name": "release-copilot-agent"})
-    provider = TracerProvider(resource=resource)
-
-    # Determine output file path
-    if output_file is None:
-        # Create timestamped file in traces/ directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        traces_dir = Path("traces")
-        traces_dir.mkdir(exist_ok=True)
-        file_path = traces_dir / f"trace_{timestamp}.jsonl"
-    else:
-        file_path = Path(output_file)
-        # Create parent directories if needed
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Open file in write mode (keep reference to prevent closing)
-    file_handle = open(file_path, "w", encoding="utf-8")
-    file_exporter = ConsoleSpanExporter(out=file_handle)
-    file_processor = BatchSpanProcessor(file_exporter)
-    provider.add_span_processor(file_processor)
-    print(f"✓ Traces will be written to: {file_path.absolute()}")
-
-    # Add console exporter if enabled
-    if enable_console:
-        console_exporter = ConsoleSpanExporter()
-        console_processor = BatchSpanProcessor(console_exporter)
-        provider.add_span_processor(console_processor)
-        print("✓ Traces will also be written to console")
-
-    # Set the global tracer provider BEFORE calling setup_observability
-    trace.set_tracer_provider(provider)
-
-    # Now enable Agent Framework observability
-    # Suppress metrics console output by redirecting to a persistent devnull
-    try:
-        from agent_framework.observability import setup_observability
-
-        # Save current stdout/stderr
-        old_stdout, old_stderr = sys.stdout, sys.stderr
-
-        # Create a persistent devnull that won't be closed
-        # This prevents "I/O operation on closed file" errors
-        devnull = open(os.devnull, 'w')
-        sys.stdout = sys.stderr = devnull
-
-        # Call setup_observability (it will capture the devnull file handles)
-        setup_observability(enable_sensitive_data=True)
-
-        # Restore stdout/stderr (but don't close devnull - it's still in use)
-        sys.stdout, sys.stderr = old_stdout, old_stderr
-    except ImportError:
-        # If agent_framework.observability is not available, that's okay
-        pass
-
-    # Mark as initialized
-    _tracing_initialized = True
+    with _tracing_lock:
+        # Another thread may have finished setup while we waited
+        if _tracing_initialized:
+            return trace.get_tracer("release-copilot-agent")
+
+        # Create our TracerProvider FIRST before calling setup_observability
+        resource = Resource.create({"service.name": "release-copilot-agent"})
+        provider = TracerProvider(resource=resource)
+
+        # Determine output file path
+        if output_file is None:
+            # Create timestamped file in traces/ directory
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            traces_dir = Path("traces")
+            traces_dir.mkdir(exist_ok=True)
+            file_path = traces_dir / f"trace_{timestamp}_{os.getpid()}.jsonl"
+        else:
+            file_path = Path(output_file)
+            # Create parent directories if needed
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Open file in write mode (keep reference to prevent closing)
+        _trace_file = open(file_path, "w", encoding="utf-8")
+        file_exporter = _JsonLinesSpanExporter(_trace_file)
+        file_processor = _batch_processor(file_exporter)
+        provider.add_span_processor(file_processor)
+        print(f"✓ Traces will be written to: {file_path.absolute()}")
+
+        # Add console exporter if enabled
+        if enable_console:
+            console_exporter = ConsoleSpanExporter()
+            console_processor = _batch_processor(console_exporter)
+            provider.add_span_processor(console_processor)
+            print("✓ Traces will also be written to console")
+
+        # Set the global tracer provider BEFORE calling setup_observability
+        trace.set_tracer_provider(provider)
+
+        # Now enable Agent Framework observability
+        # Suppress metrics console output by redirecting to the module's devnull,
+        # which stays open because setup_observability keeps a reference to it.
+        # Its close is registered before the providers' own exit hooks, so it
+        # runs after their shutdown.
+        if _devnull is None:
+            _devnull = open(os.devnull, "w")
+            atexit.register(_devnull.close)
+        try:
+            from agent_framework.observability import setup_observability
+
+            with contextlib.redirect_stdout(_devnull), contextlib.redirect_stderr(_devnull):
+                setup_observability(enable_sensitive_data=True)
+        except ImportError:
+            # If agent_framework.observability is not available, that's okay
+            pass
+
+        # Mark as initialized
+        _tracing_initialized = True
 
     # Return a tracer instance
     return trace.get_tracer("release-copilot-agent")
@@ -1,8 +1,7 @@
-import json
 from typing import Annotated
 from pydantic import Field
 from agent_framework import ai_function
-from rc_agent.config.settings import settings
+from rc_agent.services import default_logs_service
 
 
 @ai_function(
@@ -19,29 +18,5 @@ def get_job_logs(
     Returns:
         dict: Contains 'found' (bool) and 'logs' (list of log lines) if found
     """
-    # Read logs data
-    logs_file = settings.data_dir / "log.json"
-
-    try:
-        with open(logs_file, 'r') as f:
-            all_logs = json.load(f)
-    except FileNotFoundError:
-        return {
-            "found": False,
-            "error": "Logs data file not found"
-        }
-
-    # Look up the job logs
-    if job_id in all_logs:
-        logs = all_logs[job_id]
-        return {
-            "found": True,
-            "job_id": job_id,
-            "logs": logs
-        }
-
-    # Job not found
-    return {
-        "found": False,
-        "message": f"No logs found for job '{job_id}'"
-    }
+    # The shared LogsService caches the parsed file, or streams large ones
+    return default_logs_service.get_job_logs(job_id)
@@ -0,0 +1,235 @@
+"""Tests for the FastAPI endpoints, run without starting the real agent."""
+
+import importlib
+import os
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from cachetools import TTLCache
+from fastapi.testclient import TestClient
+
+from rc_agent.agents import mcp_orchestrator
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Import the API module with its trace files written under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("rc_agent.app.api")
+
+
+@pytest.fixture
+def client(api):
+    # Not entering the client as a context manager skips the lifespan, so
+    # no Azure client is built
+    return TestClient(api.app)
+
+
+def _message(role, text):
+    return SimpleNamespace(role=SimpleNamespace(value=role), text=text)
+
+
+class _FakeAgent:
+    """Stands in for the ChatAgent with canned replies and streamed updates."""
+
+    def __init__(self, deltas=(), error=None, reply="Pipeline succeeded"):
+        self.deltas = deltas
+        self.error = error
+        self.reply = reply
+        self.threads = []
+
+    def get_new_thread(self):
+        thread = object()
+        self.threads.append(thread)
+        return thread
+
+    async def run(self, message, thread=None):
+        self.last_thread = thread
+        messages = [
+            _message("user", message),
+            _message("assistant", ""),
+            _message("assistant", self.reply),
+        ]
+        return SimpleNamespace(text=self.reply, messages=messages)
+
+    async def run_stream(self, message, thread=None):
+        self.last_thread = thread
+        for delta in self.deltas:
+            yield SimpleNamespace(text=delta)
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture(autouse=True)
+def threads(api, monkeypatch):
+    """Give each test an empty conversation store."""
+    monkeypatch.setattr(api, "_threads", TTLCache(maxsize=10, ttl=3600))
+
+
+@pytest.fixture
+def agent(api, monkeypatch):
+    fake = _FakeAgent()
+    monkeypatch.setattr(api.app.state, "agent", fake, raising=False)
+    return fake
+
+
+def test_chat_without_conversation_id_mints_a_new_one(agent, client):
+    first = client.post("/chat", json={"message": "hi"}).json()
+    second = client.post("/chat", json={"message": "hi"}).json()
+
+    assert len(first["conversation_id"]) >= 32
+    assert first["conversation_id"] != second["conversation_id"]
+    assert len(agent.threads) == 2
+
+
+def test_chat_with_returned_conversation_id_continues_the_thread(agent, client):
+    conversation_id = client.post(
+        "/chat", json={"message": "hi"}).json()["conversation_id"]
+
+    response = client.post(
+        "/chat", json={"message": "and now?", "conversation_id": conversation_id})
+
+    assert response.json()["conversation_id"] == conversation_id
+    assert agent.threads == [agent.last_thread]
+
+
+def test_chat_with_unknown_conversation_id_starts_a_new_conversation(
+        agent, client):
+    response = client.post(
+        "/chat", json={"message": "hi", "conversation_id": "made-up"})
+
+    assert response.status_code == 200
+    assert response.json()["conversation_id"] not in ("made-up", None)
+    assert len(agent.threads) == 1
+
+
+def test_chat_returns_the_reply_without_history_by_default(agent, client):
+    response = client.post("/chat", json={"message": "status?"})
+
+    assert response.status_code == 200
+    assert response.json()["response"] == "Pipeline succeeded"
+    assert response.json()["messages"] == []
+
+
+def test_chat_returns_only_the_last_assistant_message(api, client, monkeypatch):
+    class InterimTurnAgent(_FakeAgent):
+        async def run(self, message, thread=None):
+            messages = [
+                _message("user", message),
+                _message("assistant", "Let me check."),
+                _message("tool", '{"status": "succeeded"}'),
+                _message("assistant", "It succeeded."),
+            ]
+            return SimpleNamespace(
+                text="Let me check. It succeeded.", messages=messages)
+
+    agent = InterimTurnAgent()
+    monkeypatch.setattr(api.app.state, "agent", agent, raising=False)
+
+    response = client.post("/chat", json={"message": "status?"})
+
+    assert response.json()["response"] == "It succeeded."
+
+
+def test_chat_returns_the_history_when_asked(agent, client):
+    response = client.post(
+        "/chat", json={"message": "status?", "include_history": True})
+
+    assert response.json()["messages"] == [
+        {"role": "user", "content": "status?"},
+        {"role": "assistant", "content": ""},
+        {"role": "assistant", "content": "Pipeline succeeded"},
+    ]
+
+
+def _sse_frames(body):
+    """Split a text/event-stream body into (event, data) pairs."""
+    frames = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        frames.append((fields.get("event"), orjson.loads(fields["data"])))
+    return frames
+
+
+def test_chat_stream_sends_deltas_then_a_done_event(api, client, monkeypatch):
+    monkeypatch.setattr(
+        api.app.state, "agent", _FakeAgent(["Pipeline ", "", "succeeded"]),
+        raising=False)
+
+    response = client.post("/chat/stream", json={"message": "status?"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = _sse_frames(response.text)
+    assert frames[:-1] == [
+        (None, {"delta": "Pipeline "}), (None, {"delta": "succeeded"})]
+    assert frames[-1][0] == "done"
+    assert frames[-1][1]["conversation_id"] in api._threads
+
+
+def test_chat_stream_continues_a_conversation_started_by_chat(
+        api, client, monkeypatch):
+    fake = _FakeAgent(["ok"])
+    monkeypatch.setattr(api.app.state, "agent", fake, raising=False)
+    conversation_id = client.post(
+        "/chat", json={"message": "hi"}).json()["conversation_id"]
+
+    frames = _sse_frames(client.post("/chat/stream", json={
+        "message": "more", "conversation_id": conversation_id}).text)
+
+    assert frames[-1] == ("done", {"conversation_id": conversation_id})
+    assert fake.threads == [fake.last_thread]
+
+
+def test_chat_stream_reports_agent_errors_as_an_error_event(
+        api, client, monkeypatch):
+    monkeypatch.setattr(
+        api.app.state, "agent",
+        _FakeAgent(["partial"], error=RuntimeError("boom")), raising=False)
+
+    frames = _sse_frames(client.post("/chat/stream", json={"message": "hi"}).text)
+
+    assert frames[0] == (None, {"delta": "partial"})
+    assert frames[-1] == ("error", {"detail": "Error processing request: boom"})
+
+
+def test_chat_stream_without_an_agent_is_unavailable(api, client, monkeypatch):
+    monkeypatch.setattr(api.app.state, "agent", None, raising=False)
+
+    assert client.post("/chat/stream", json={"message": "hi"}).status_code == 503
+
+
+def _set_admin_token(monkeypatch, api, token):
+    monkeypatch.setattr(api, "settings", SimpleNamespace(admin_token=token))
+
+
+def test_admin_endpoint_is_disabled_without_a_configured_token(
+        api, client, monkeypatch):
+    _set_admin_token(monkeypatch, api, None)
+
+    response = client.post(
+        "/admin/cache/clear", headers={"X-Admin-Token": "anything"})
+
+    assert response.status_code == 404
+
+
+def test_admin_endpoint_rejects_a_missing_or_wrong_token(api, client, monkeypatch):
+    _set_admin_token(monkeypatch, api, "s3cret")
+
+    assert client.post("/admin/cache/clear").status_code == 401
+    assert client.post(
+        "/admin/cache/clear", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+
+def test_admin_endpoint_clears_the_tool_cache_with_the_right_token(
+        api, client, monkeypatch):
+    _set_admin_token(monkeypatch, api, "s3cret")
+    mcp_orchestrator.clear_tool_cache()
+    mcp_orchestrator._tool_cache[("get_job_logs", ("job-1",))] = "{}"
+
+    response = client.post(
+        "/admin/cache/clear", headers={"X-Admin-Token": "s3cret"})
+
+    assert response.status_code == 200
+    assert response.json() == {"cleared_entries": 1, "pid": os.getpid()}
+    assert len(mcp_orchestrator._tool_cache) == 0
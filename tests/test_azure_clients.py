@@ -0,0 +1,73 @@
+"""Tests for the shared Azure client lifecycle."""
+
+import asyncio
+
+import pytest
+
+from rc_agent import azure_clients
+
+_ENDPOINT = "https://example.openai.azure.com/"
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Start and end each test without cached clients."""
+    yield
+    asyncio.run(azure_clients.close_clients())
+
+
+def test_close_clients_closes_the_pool_and_the_next_call_builds_a_new_one():
+    pool = azure_clients.get_http_client()
+
+    asyncio.run(azure_clients.close_clients())
+
+    assert pool.is_closed
+    assert azure_clients.get_http_client() is not pool
+
+
+def test_close_clients_drops_cached_chat_clients():
+    chat_client = azure_clients.get_chat_client(_ENDPOINT, "gpt-4o")
+    assert azure_clients.get_chat_client(_ENDPOINT, "gpt-4o") is chat_client
+
+    asyncio.run(azure_clients.close_clients())
+
+    assert azure_clients.get_chat_client(_ENDPOINT, "gpt-4o") is not chat_client
+
+
+def test_close_clients_without_open_clients_builds_no_pool():
+    asyncio.run(azure_clients.close_clients())
+
+    assert azure_clients.get_http_client.cache_info().currsize == 0
+
+
+def test_close_clients_drops_the_cached_orchestrator(monkeypatch):
+    from rc_agent.agents import mcp_orchestrator
+
+    cleared = []
+    monkeypatch.setattr(
+        mcp_orchestrator.create_mcp_orchestrator, "cache_clear",
+        lambda: cleared.append(True))
+
+    asyncio.run(azure_clients.close_clients())
+
+    assert cleared == [True]
+
+
+def test_close_clients_closes_the_credential_and_the_next_call_builds_a_new_one(
+        monkeypatch):
+    closed = []
+    credential = azure_clients.get_credential()
+
+    async def close():
+        closed.append(True)
+
+    monkeypatch.setattr(credential, "close", close)
+
+    asyncio.run(azure_clients.close_clients())
+
+    assert closed == [True]
+    assert azure_clients.get_credential() is not credential
+
+
+def test_token_provider_is_async():
+    assert asyncio.iscoroutinefunction(azure_clients.get_token_provider())
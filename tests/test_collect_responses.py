@@ -0,0 +1,27 @@
+"""Tests for the response collection run's client cleanup."""
+
+import asyncio
+
+import pytest
+
+from rc_agent import azure_clients
+from rc_agent.agents import mcp_orchestrator
+from rc_agent.eval import collect_responses
+
+
+def test_clients_are_closed_when_the_collection_fails(monkeypatch):
+    closed = []
+
+    def fail_create():
+        raise RuntimeError("agent build failed")
+
+    async def close_clients():
+        closed.append(True)
+
+    monkeypatch.setattr(mcp_orchestrator, "create_mcp_orchestrator", fail_create)
+    monkeypatch.setattr(azure_clients, "close_clients", close_clients)
+
+    with pytest.raises(RuntimeError, match="agent build failed"):
+        asyncio.run(collect_responses.run_agent_collection())
+
+    assert closed == [True]
@@ -0,0 +1,140 @@
+"""Tests for reusing collected responses in the tool selection evaluation."""
+
+import asyncio
+import os
+
+import orjson
+import pytest
+
+from rc_agent.eval import eval_tool_selection
+from rc_agent.eval.eval_tool_selection import load_reusable_responses
+
+
+def _write_json(path, data, mtime_ns):
+    path.write_bytes(orjson.dumps(data))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _record(test_case_id, **fields):
+    return {
+        "test_case_id": test_case_id,
+        "query": f"query {test_case_id}",
+        "expected_tools": ["get_pipeline_status"],
+        **fields,
+    }
+
+
+def test_fresh_collected_responses_are_reused(tmp_path):
+    ground_truth = tmp_path / "ground_truth.json"
+    responses = tmp_path / "collected_responses.json"
+    _write_json(ground_truth, [], 1_000_000_000)
+    _write_json(responses, [
+        _record(1, actual_tool_calls=[], response="ok"),
+        _record(2, actual_tool_calls=[], response="ok"),
+    ], 2_000_000_000)
+
+    assert load_reusable_responses(responses, ground_truth).keys() == {1, 2}
+
+
+def test_collected_responses_older_than_ground_truth_are_not_reused(tmp_path):
+    ground_truth = tmp_path / "ground_truth.json"
+    responses = tmp_path / "collected_responses.json"
+    _write_json(responses, [_record(1, response="ok")], 1_000_000_000)
+    _write_json(ground_truth, [], 2_000_000_000)
+
+    assert load_reusable_responses(responses, ground_truth) == {}
+
+
+def test_missing_collected_responses_are_not_reused(tmp_path):
+    ground_truth = tmp_path / "ground_truth.json"
+    _write_json(ground_truth, [], 1_000_000_000)
+
+    assert load_reusable_responses(
+        tmp_path / "collected_responses.json", ground_truth) == {}
+
+
+def test_errored_collected_responses_are_run_again(tmp_path):
+    ground_truth = tmp_path / "ground_truth.json"
+    responses = tmp_path / "collected_responses.json"
+    _write_json(ground_truth, [], 1_000_000_000)
+    _write_json(responses, [
+        _record(1, actual_tool_calls=[], response="ok"),
+        _record(2, error="429 Too Many Requests"),
+    ], 2_000_000_000)
+
+    assert load_reusable_responses(responses, ground_truth).keys() == {1}
+
+
+@pytest.fixture
+def eval_dir(tmp_path, monkeypatch):
+    """Run the evaluation in tmp_path with the agent and judge stubbed out."""
+    ground_truth = tmp_path / "ground_truth.json"
+    _write_json(ground_truth, [{
+        "query": "query 1",
+        "expected_tools": ["get_pipeline_status"],
+    }], 1_000_000_000)
+
+    async def run_agent(agent, query):
+        return {
+            "query": query,
+            "response": "fresh",
+            "tool_calls": [{"name": "get_pipeline_status", "arguments": {}}],
+        }
+
+    async def close_clients():
+        pass
+
+    monkeypatch.setattr(eval_tool_selection, "__file__",
+                        str(tmp_path / "eval_tool_selection.py"))
+    monkeypatch.setattr(eval_tool_selection, "run_agent_and_capture_tools",
+                        run_agent)
+    monkeypatch.setattr(eval_tool_selection, "create_mcp_orchestrator",
+                        lambda: object())
+    monkeypatch.setattr(eval_tool_selection, "get_openai_client",
+                        lambda *args, **kwargs: object())
+    monkeypatch.setattr(eval_tool_selection, "close_clients", close_clients)
+    return tmp_path
+
+
+def _write_collected(eval_dir):
+    responses = eval_dir / "collected_responses.json"
+    _write_json(responses, [_record(
+        1,
+        actual_tool_calls=[{"name": "get_pipeline_status", "arguments": {}}],
+        response="collected",
+    )], 2_000_000_000)
+    return responses
+
+
+def test_evaluation_runs_the_agent_unless_reuse_is_requested(eval_dir):
+    responses = _write_collected(eval_dir)
+    before = responses.read_bytes()
+
+    results = asyncio.run(eval_tool_selection.run_evaluation())
+
+    assert results[0]["response"] == "fresh"
+    assert responses.read_bytes() == before
+    saved = orjson.loads((eval_dir / "tool_selection_responses.json").read_bytes())
+    assert saved[0]["response"] == "fresh"
+
+
+def test_evaluation_judges_collected_responses_when_reuse_is_requested(eval_dir):
+    _write_collected(eval_dir)
+
+    results = asyncio.run(
+        eval_tool_selection.run_evaluation(reuse_responses=True))
+
+    assert results[0]["response"] == "collected"
+    assert not (eval_dir / "tool_selection_responses.json").exists()
+
+
+def test_tool_call_without_a_name_is_reported_not_errored(capsys):
+    test_case = {"query": "query 1", "expected_tools": ["get_pipeline_status"]}
+    collected = _record(1, actual_tool_calls=[{"arguments": {}}], response="ok")
+
+    result = asyncio.run(eval_tool_selection._run_case(
+        None, object(), 1, 1, test_case, asyncio.Semaphore(1), collected))
+
+    assert "error" not in result
+    assert result["manual_evaluation"]["recall"] == 0
+    assert "  - <unknown>: {}" in capsys.readouterr().out
@@ -0,0 +1,233 @@
+"""Tests for the evaluation judge paths, run against fake Azure OpenAI clients."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from rc_agent.eval import evaluate
+
+
+def _record(test_case_id, **fields):
+    return {
+        "test_case_id": test_case_id,
+        "query": f"query {test_case_id}",
+        "expected_tools": ["get_pipeline_status"],
+        **fields,
+    }
+
+
+def _batch_output_line(custom_id, content):
+    return json.dumps({
+        "custom_id": custom_id,
+        "response": {"body": {"choices": [{"message": {"content": content}}]}},
+    })
+
+
+class _FakeBatchClient:
+    """Records the submitted batch file and returns canned batch output."""
+
+    def __init__(self, output_lines, final_status="completed"):
+        output = "\n".join(output_lines)
+        self.output = SimpleNamespace(text=output, content=output.encode())
+        self.final_status = final_status
+        self.submitted = None
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve_batch)
+
+    async def _create_file(self, file, purpose):
+        self.submitted = [json.loads(line) for line in file[1].splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    async def _create_batch(self, **kwargs):
+        return SimpleNamespace(id="batch-1", status="in_progress", output_file_id=None)
+
+    async def _retrieve_batch(self, batch_id):
+        return SimpleNamespace(
+            id=batch_id, status=self.final_status, output_file_id="file-out")
+
+    async def _content(self, file_id):
+        return self.output
+
+
+class _FakeChatClient:
+    """Counts judge calls and answers each with a fixed completion."""
+
+    def __init__(self, content='{"overall_score": 0.8}', error=None):
+        self.calls = 0
+        self.content = content
+        self.error = error
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def judge_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / ".judge_cache"
+    monkeypatch.setattr(evaluate, "_JUDGE_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+def _judge(client, response="ok", use_cache=True):
+    return asyncio.run(evaluate.evaluate_with_llm(
+        client, "query", response, [], ["get_job_logs"], use_cache=use_cache))
+
+
+def test_judge_prompt_lists_tool_parameters_and_quotes_the_query():
+    system, user = evaluate.build_judge_messages(
+        "why did it fail?", "ok", [], ["get_job_logs"])
+
+    assert system["role"] == "system"
+    assert 'User Query: "why did it fail?"' in user["content"]
+    assert '"required":["job_id"]' in user["content"]
+    assert "Were all necessary tools selected? (0-1)" in user["content"]
+
+
+def test_judge_cache_key_is_stable_for_identical_requests():
+    messages = evaluate.build_judge_messages(
+        "query", "response", [], ["get_job_logs"])
+
+    assert evaluate._judge_cache_key("gpt-4o", messages) == evaluate._judge_cache_key(
+        "gpt-4o", evaluate.build_judge_messages(
+            "query", "response", [], ["get_job_logs"]))
+
+
+def test_judge_cache_key_changes_with_model_and_prompt():
+    messages = evaluate.build_judge_messages(
+        "query", "response", [], ["get_job_logs"])
+    key = evaluate._judge_cache_key("gpt-4o", messages)
+
+    assert evaluate._judge_cache_key("gpt-4o-mini", messages) != key
+    assert evaluate._judge_cache_key("gpt-4o", evaluate.build_judge_messages(
+        "query", "other response", [], ["get_job_logs"])) != key
+
+
+def test_repeated_judge_request_is_served_from_the_disk_cache(judge_cache_dir):
+    client = _FakeChatClient()
+
+    first = _judge(client)
+    second = _judge(client)
+
+    assert first == second == {"overall_score": 0.8}
+    assert client.calls == 1
+    assert len(list(judge_cache_dir.glob("*.json"))) == 1
+
+
+def test_failed_judge_calls_are_not_cached(judge_cache_dir):
+    result = _judge(_FakeChatClient(error=RuntimeError("timeout")))
+
+    assert result["overall_score"] == 0.0
+    assert not judge_cache_dir.exists()
+
+
+def test_judge_cache_can_be_bypassed(judge_cache_dir):
+    client = _FakeChatClient()
+
+    _judge(client, use_cache=False)
+    _judge(client, use_cache=False)
+
+    assert client.calls == 2
+    assert not judge_cache_dir.exists()
+
+
+def _evaluate_case(data_point, eval_client, force_llm=False):
+    return asyncio.run(evaluate._evaluate_case(
+        eval_client, data_point, asyncio.Semaphore(1), use_cache=False,
+        force_llm=force_llm))
+
+
+def test_errored_case_is_skipped_without_judging():
+    client = _FakeChatClient()
+
+    result = _evaluate_case(_record(1, error="timeout"), client)
+
+    assert result["skipped"] is True
+    assert "llm_evaluation" not in result
+    assert client.calls == 0
+
+
+def test_empty_response_is_not_sent_to_the_judge():
+    client = _FakeChatClient()
+
+    result = _evaluate_case(_record(
+        1, actual_tool_calls=[{"name": "get_job_logs"}], response=""), client)
+
+    assert result["llm_evaluation"]["overall_score"] == 0.0
+    assert "No agent response" in result["llm_evaluation"]["error"]
+    assert client.calls == 0
+
+
+def test_exact_match_short_circuits_the_judge():
+    client = _FakeChatClient()
+
+    result = _evaluate_case(_record(
+        1, actual_tool_calls=[{"name": "get_pipeline_status"}], response="ok"),
+        client)
+
+    assert result["manual_evaluation"]["exact_match"] is True
+    assert result["llm_evaluation"] == evaluate.EXACT_MATCH_EVALUATION
+    assert client.calls == 0
+
+
+def test_exact_match_is_judged_when_forced():
+    client = _FakeChatClient()
+
+    result = _evaluate_case(_record(
+        1, actual_tool_calls=[{"name": "get_pipeline_status"}], response="ok"),
+        client, force_llm=True)
+
+    assert result["llm_evaluation"] == {"overall_score": 0.8}
+    assert client.calls == 1
+
+
+@pytest.fixture(autouse=True)
+def no_batch_polling_delay(monkeypatch):
+    monkeypatch.setattr(evaluate, "_BATCH_POLL_SECONDS", 0)
+
+
+def test_batch_results_are_parsed_by_test_case_id():
+    client = _FakeBatchClient([
+        _batch_output_line("1", '{"overall_score": 0.9}'),
+        "",
+        _batch_output_line("3", '{"overall_score": 0.4}'),
+    ])
+    collected = [
+        _record(1, response="ok", actual_tool_calls=[]),
+        _record(2, error="timeout"),
+        _record(3, response="ok", actual_tool_calls=[]),
+    ]
+
+    evaluations = asyncio.run(evaluate.evaluate_with_batch(client, collected))
+
+    assert [request["custom_id"] for request in client.submitted] == ["1", "3"]
+    assert evaluations == {
+        "1": {"overall_score": 0.9}, "3": {"overall_score": 0.4}}
+
+
+def test_unparseable_batch_results_are_recorded_as_judge_failures():
+    client = _FakeBatchClient([
+        _batch_output_line("1", "not json"),
+        json.dumps({"custom_id": "2", "error": {"code": "content_filter"}}),
+    ])
+    collected = [_record(1, response="ok"), _record(2, response="ok")]
+
+    evaluations = asyncio.run(evaluate.evaluate_with_batch(client, collected))
+
+    assert evaluations["1"]["overall_score"] == 0.0
+    assert "content_filter" in evaluations["2"]["error"]
+
+
+def test_failed_batch_returns_no_evaluations():
+    client = _FakeBatchClient([], final_status="failed")
+
+    assert asyncio.run(evaluate.evaluate_with_batch(
+        client, [_record(1, response="ok")])) == {}
@@ -0,0 +1,146 @@
+"""Tests for LogsService caching and data file error handling."""
+
+import itertools
+import os
+
+import orjson
+import pytest
+
+from rc_agent.services import DataFileError, LogsService
+from rc_agent.services import logs_service as logs_service_module
+
+# Seconds added to each written file's mtime, so rewrites within the
+# filesystem's timestamp resolution still look like edits
+_seconds = itertools.count(1)
+
+
+def _write_logs(path, logs):
+    """Write logs and push the mtime forward so every write is seen."""
+    path.write_bytes(orjson.dumps(logs))
+    mtime_ns = path.stat().st_mtime_ns + next(_seconds) * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture(params=[False, True], ids=["in-memory", "streaming"])
+def streaming(request, monkeypatch):
+    """Run a test against both the whole-file cache and the streaming scan."""
+    if request.param:
+        monkeypatch.setattr(logs_service_module, "_STREAMING_THRESHOLD_BYTES", 0)
+    return request.param
+
+
+def test_get_job_logs_returns_lines_for_job(tmp_path, streaming):
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": ["start", "done"]})
+
+    result = LogsService(data_file).get_job_logs("job-1")
+
+    assert result == {"found": True, "job_id": "job-1", "logs": ["start", "done"]}
+
+
+def test_get_job_logs_reports_unknown_job_as_not_found(tmp_path, streaming):
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": ["start"]})
+
+    result = LogsService(data_file).get_job_logs("job-2")
+
+    assert result["found"] is False
+    assert "job-2" in result["message"]
+
+
+def test_edited_data_file_is_reloaded(tmp_path, streaming):
+    data_file = tmp_path / "log.json"
+    service = LogsService(data_file)
+    _write_logs(data_file, {"job-1": ["first"]})
+    assert service.get_job_logs("job-1")["logs"] == ["first"]
+
+    _write_logs(data_file, {"job-1": ["second"], "job-2": ["new"]})
+
+    assert service.get_job_logs("job-1")["logs"] == ["second"]
+    assert service.get_job_logs("job-2")["found"] is True
+
+
+def test_mutating_results_does_not_change_the_cache(tmp_path, streaming):
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": ["start"]})
+    service = LogsService(data_file)
+
+    service.get_job_logs("job-1")["logs"].append("tampered")
+
+    assert service.get_job_logs("job-1")["logs"] == ["start"]
+
+
+def test_unchanged_data_file_is_not_parsed_again(tmp_path, monkeypatch):
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": ["start"]})
+    service = LogsService(data_file)
+    service.get_job_logs("job-1")
+
+    def fail_load(*args):
+        raise AssertionError("data file parsed again")
+
+    monkeypatch.setattr(logs_service_module, "load_json_file", fail_load)
+
+    assert service.get_job_logs("job-1")["found"] is True
+
+
+def test_list_all_job_ids_returns_every_job(tmp_path):
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": [], "job-2": []})
+
+    assert LogsService(data_file).list_all_job_ids() == ["job-1", "job-2"]
+
+
+def test_missing_data_file_raises_data_file_error(tmp_path, streaming):
+    service = LogsService(tmp_path / "missing.json")
+
+    with pytest.raises(DataFileError, match="Logs data file not found"):
+        service._find_job_logs("job-1")
+
+    result = service.get_job_logs("job-1")
+    assert result == {"found": False, "error": "Logs data file not found"}
+    assert service.list_all_job_ids() == []
+
+
+def test_malformed_data_file_raises_data_file_error(tmp_path, streaming):
+    data_file = tmp_path / "log.json"
+    data_file.write_text('{"job-1": [', encoding="utf-8")
+    service = LogsService(data_file)
+
+    with pytest.raises(DataFileError, match="Invalid JSON in logs data file"):
+        service._find_job_logs("job-1")
+
+    assert "Invalid JSON" in service.get_job_logs("job-1")["error"]
+    assert service.list_all_job_ids() == []
+
+
+def test_job_with_null_logs_is_found(tmp_path, streaming):
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": None})
+
+    result = LogsService(data_file).get_job_logs("job-1")
+
+    assert result == {"found": True, "job_id": "job-1", "logs": None}
+
+
+def test_unreadable_data_file_raises_data_file_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(logs_service_module, "_STREAMING_THRESHOLD_BYTES", 0)
+    data_file = tmp_path / "log.json"
+    _write_logs(data_file, {"job-1": ["start"]})
+
+    def fail_open(*args, **kwargs):
+        raise PermissionError("Permission denied")
+
+    monkeypatch.setattr("builtins.open", fail_open)
+
+    with pytest.raises(DataFileError, match="Could not read logs data file"):
+        LogsService(data_file)._find_job_logs("job-1")
+
+
+def test_missing_data_file_path_is_logged_not_returned(caplog, tmp_path):
+    data_file = tmp_path / "missing.json"
+
+    result = LogsService(data_file).get_job_logs("job-1")
+
+    assert str(data_file) not in result["error"]
+    assert str(data_file) in caplog.text
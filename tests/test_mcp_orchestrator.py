@@ -0,0 +1,95 @@
+"""Tests for the orchestrator's tool result cache."""
+
+import pytest
+from cachetools import TTLCache
+
+from rc_agent.agents import mcp_orchestrator
+
+
+@pytest.fixture(autouse=True)
+def tool_cache(monkeypatch):
+    """Give each test an empty tool cache."""
+    cache = TTLCache(maxsize=512, ttl=30)
+    monkeypatch.setattr(mcp_orchestrator, "_tool_cache", cache)
+    return cache
+
+
+def _counting_tool(calls, found=True):
+    @mcp_orchestrator.memoize_tool
+    def get_job_logs(job_id: str) -> dict:
+        calls.append(job_id)
+        return {"found": found, "job_id": job_id}
+
+    return get_job_logs
+
+
+def test_repeated_tool_call_is_served_from_the_cache():
+    calls = []
+    get_job_logs = _counting_tool(calls)
+
+    assert (get_job_logs("job-1") == get_job_logs("job-1")
+            == '{"found":true,"job_id":"job-1"}')
+    assert calls == ["job-1"]
+
+
+def test_tool_calls_with_different_arguments_are_cached_separately():
+    calls = []
+    get_job_logs = _counting_tool(calls)
+
+    get_job_logs("job-1")
+    get_job_logs(job_id="job-2")
+
+    assert calls == ["job-1", "job-2"]
+
+
+def test_expired_results_are_fetched_again(tool_cache):
+    calls = []
+    get_job_logs = _counting_tool(calls)
+
+    get_job_logs("job-1")
+    tool_cache.expire(tool_cache.timer() + 60)
+    get_job_logs("job-1")
+
+    assert calls == ["job-1", "job-1"]
+
+
+def test_not_found_results_are_not_cached(tool_cache):
+    calls = []
+    get_job_logs = _counting_tool(calls, found=False)
+
+    get_job_logs("job-1")
+    get_job_logs("job-1")
+
+    assert calls == ["job-1", "job-1"]
+    assert len(tool_cache) == 0
+
+
+def test_data_file_errors_are_not_cached(tool_cache):
+    calls = []
+
+    @mcp_orchestrator.memoize_tool
+    def get_job_logs(job_id: str) -> dict:
+        calls.append(job_id)
+        return {"found": False, "error": "Logs data file not found"}
+
+    get_job_logs("job-1")
+    get_job_logs("job-1")
+
+    assert calls == ["job-1", "job-1"]
+    assert len(tool_cache) == 0
+
+
+def test_memoized_tool_keeps_its_name():
+    assert _counting_tool([]).__name__ == "get_job_logs"
+
+
+def test_clear_tool_cache_drops_cached_results_and_counts_them():
+    calls = []
+    get_job_logs = _counting_tool(calls)
+    get_job_logs("job-1")
+    get_job_logs("job-2")
+
+    assert mcp_orchestrator.clear_tool_cache() == 2
+
+    get_job_logs("job-1")
+    assert calls == ["job-1", "job-2", "job-1"]
@@ -0,0 +1,160 @@
+"""Tests for PipelineService caching and data file error handling."""
+
+import itertools
+import os
+
+import orjson
+import pytest
+
+from rc_agent.services import DataFileError, PipelineService
+from rc_agent.services import pipeline_service as pipeline_service_module
+
+# Seconds added to each written file's mtime, so rewrites within the
+# filesystem's timestamp resolution still look like edits
+_seconds = itertools.count(1)
+
+
+def _write_pipelines(path, pipelines):
+    """Write pipelines and push the mtime forward so every write is seen."""
+    path.write_bytes(orjson.dumps(pipelines))
+    mtime_ns = path.stat().st_mtime_ns + next(_seconds) * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _pipeline(status, service="payments", environment="prod"):
+    return {
+        "service": service,
+        "environment": environment,
+        "status": status,
+        "pipeline_id": "pipe-1",
+        "branch": "main",
+        "started_at": "2025-11-20T22:00:00Z",
+        "finished_at": "2025-11-20T22:05:32Z",
+        "failed_job_id": None,
+    }
+
+
+def test_get_pipeline_status_returns_matching_pipeline(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("succeeded")])
+
+    result = PipelineService(data_file).get_pipeline_status("payments", "prod")
+
+    assert result["found"] is True
+    assert result["status"] == "succeeded"
+    assert result["pipeline_id"] == "pipe-1"
+
+
+def test_get_pipeline_status_returns_every_status_field(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("failed") | {"failed_job_id": "job-9"}])
+
+    result = PipelineService(data_file).get_pipeline_status("payments", "prod")
+
+    assert result == {
+        "found": True,
+        "status": "failed",
+        "pipeline_id": "pipe-1",
+        "branch": "main",
+        "started_at": "2025-11-20T22:00:00Z",
+        "finished_at": "2025-11-20T22:05:32Z",
+        "failed_job_id": "job-9",
+    }
+
+
+def test_mutating_results_does_not_change_the_cache(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("succeeded")])
+    service = PipelineService(data_file)
+
+    service.get_pipeline_status("payments", "prod")["status"] = "tampered"
+    service.list_all_pipelines()[0]["status"] = "tampered"
+
+    assert service.get_pipeline_status("payments", "prod")["status"] == "succeeded"
+    assert service.list_all_pipelines()[0]["status"] == "succeeded"
+
+
+def test_get_pipeline_status_prefers_first_matching_record(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("failed"), _pipeline("succeeded")])
+
+    result = PipelineService(data_file).get_pipeline_status("payments", "prod")
+
+    assert result["status"] == "failed"
+
+
+def test_get_pipeline_status_reports_unknown_service_as_not_found(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("succeeded")])
+
+    result = PipelineService(data_file).get_pipeline_status("checkout", "prod")
+
+    assert result["found"] is False
+    assert "checkout" in result["message"]
+
+
+def test_edited_data_file_is_reloaded(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    service = PipelineService(data_file)
+    _write_pipelines(data_file, [_pipeline("running")])
+    assert service.get_pipeline_status("payments", "prod")["status"] == "running"
+
+    _write_pipelines(data_file, [_pipeline("failed")])
+
+    assert service.get_pipeline_status("payments", "prod")["status"] == "failed"
+
+
+def test_unchanged_data_file_is_not_parsed_again(tmp_path, monkeypatch):
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("succeeded")])
+    service = PipelineService(data_file)
+    service.get_pipeline_status("payments", "prod")
+
+    def fail_load(*args):
+        raise AssertionError("data file parsed again")
+
+    monkeypatch.setattr(pipeline_service_module, "load_json_file", fail_load)
+
+    assert service.get_pipeline_status("payments", "prod")["found"] is True
+
+
+def test_large_data_file_is_parsed_through_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr("rc_agent.services._json_file._MMAP_THRESHOLD_BYTES", 0)
+    data_file = tmp_path / "pipelines.json"
+    _write_pipelines(data_file, [_pipeline("succeeded")])
+
+    result = PipelineService(data_file).get_pipeline_status("payments", "prod")
+
+    assert result["status"] == "succeeded"
+
+
+def test_missing_data_file_raises_data_file_error(tmp_path):
+    service = PipelineService(tmp_path / "missing.json")
+
+    with pytest.raises(DataFileError, match="Pipelines data file not found"):
+        service._ensure_loaded()
+
+    result = service.get_pipeline_status("payments", "prod")
+    assert result == {"found": False, "error": "Pipelines data file not found"}
+    assert service.list_all_pipelines() == []
+
+
+def test_malformed_data_file_raises_data_file_error(tmp_path):
+    data_file = tmp_path / "pipelines.json"
+    data_file.write_text("[{not json", encoding="utf-8")
+    service = PipelineService(data_file)
+
+    with pytest.raises(DataFileError, match="Invalid JSON in pipelines data file"):
+        service._ensure_loaded()
+
+    assert "Invalid JSON" in service.get_pipeline_status("payments", "prod")["error"]
+    assert service.list_all_pipelines() == []
+
+
+def test_missing_data_file_path_is_logged_not_returned(caplog, tmp_path):
+    data_file = tmp_path / "missing.json"
+
+    result = PipelineService(data_file).get_pipeline_status("payments", "prod")
+
+    assert str(data_file) not in result["error"]
+    assert str(data_file) in caplog.text